@@ -1,13 +1,49 @@
 import csv
+import heapq
 import re
 import json
 import os
 from datetime import datetime, timedelta
-from collections import defaultdict
-import itertools
+from bisect import insort
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 from typing import List, Dict, Tuple
 import unicodedata
 
+# Geslacht waarden zoals ze in de spelers CSV voorkomen
+MANNELIJKE_GESLACHTEN = frozenset({'M', 'Man', 'Jongen'})
+VROUWELIJKE_GESLACHTEN = frozenset({'V', 'Vrouw', 'Meisje'})
+
+
+@lru_cache(maxsize=None)
+def tijd_naar_minuten(tijd_str):
+    """Zet 'HH:MM' om naar minuten sinds middernacht, None bij een ongeldige tijd (gecachet per tijd string)"""
+    if not tijd_str or ':' not in tijd_str or not tijd_str.replace(':','').isdigit():
+        return None
+    try:
+        uur, minuut = map(int, tijd_str.split(':'))
+        return uur * 60 + minuut
+    except Exception:
+        return None
+
+# Algoritme instantie per worker proces voor parallelle weekplanning
+_week_worker_algoritme = None
+
+
+def _init_week_worker(algoritme):
+    """Initialiseer een worker proces met een kopie van het algoritme (eenmalig per proces)"""
+    global _week_worker_algoritme
+    _week_worker_algoritme = algoritme
+
+
+def _plan_week_in_worker(week_nummer):
+    """Plan één week in een worker proces"""
+    return _week_worker_algoritme._plan_week(week_nummer)
+
+
 class HybridPlanningAlgorithm:
     def __init__(self, config_path=None):
         if config_path is None:
@@ -24,7 +60,23 @@ class HybridPlanningAlgorithm:
         
         # Nieuwe voorkeuren data structuren
         self.samen_met_voorkeuren = {}  # SpelerID -> Set van gewenste partner namen
+        self.samen_met_voorkeuren_ids = {}  # SpelerID -> Frozenset van gewenste partner SpelerIDs
         self.speler_naam_naar_id = {}   # "Voornaam Achternaam" -> SpelerID
+        self._tijdslot_maskers = {}     # Tijdslot string -> bitmasker (één bit per minuut)
+        self._beschikbaarheid_maskers = {}  # Tijdslot string (ook legacy "HH:MM") -> bitmasker of None
+        self._spelers_per_locatie = {}  # LocatieVoorkeur -> List van spelers (in laadvolgorde)
+        self._score_cache = {}          # (gesorteerde speler indices, locatie) -> groepskwaliteitsscore
+        self._geslacht_score_tabellen = {}  # (scoring config, groepsgrootte) -> score per aantal mannen
+        self._banen_per_dag = {}        # Dag (gekapitaliseerd) -> List van banen (in laadvolgorde)
+        self._banen_per_dag_slot = {}   # Dag (gekapitaliseerd) -> {(locatie, tijdslot): List van banen}
+        self._banen_per_slot = {}       # (Dag, Locatie, Tijdslot) zoals in de CSV -> List van banen (in laadvolgorde)
+        self._banen_per_locatie = {}    # Locatie -> List van banen (in laadvolgorde)
+        self._spelers_per_slot = {}     # (dag, locatie, tijdslot) -> List van qua tijd en locatie passende spelers
+        self._beschikbare_spelers_per_slot = {}  # (dag, locatie, tijdslot) -> spelers die _zijn_alle_spelers_beschikbaar halen
+        self._planning_index = None     # (week, dag, locatie, tijdslot, baan) -> oplopende posities in self.planning
+        self._planning_per_week = None  # Week -> matches in planningvolgorde (naast _planning_index bijgehouden)
+        self._indices_per_speler_id = {}  # SpelerID -> posities in self.spelers
+        self._speler_per_norm_naam = {}   # Genormaliseerde volledige naam -> eerste speler met die naam
         
         # Dag mapping
         self.dag_mapping = {
@@ -54,6 +106,9 @@ class HybridPlanningAlgorithm:
         self.max_verbeter_iteraties = self.optimalisatie_instellingen['max_verbeter_iteraties']
         self.min_score_verbetering = self.optimalisatie_instellingen['min_score_verbetering']
         
+        # Hoogst haalbare groepsscore volgens de configuratie (bovengrens voor vroegtijdig stoppen)
+        self.maximale_groepsscore = self._bepaal_maximale_groepsscore()
+        
     def _laad_configuratie(self, config_path):
         """Laad configuratie uit JSON bestand"""
         if not os.path.exists(config_path):
@@ -137,7 +192,8 @@ class HybridPlanningAlgorithm:
                     "spelers_per_groep": 4,
                     "performance_cutoff_homogeen": 8,
                     "max_combinaties_check": 16,
-                    "aantal_dummy_trainers": 4
+                    "aantal_dummy_trainers": 4,
+                    "parallelle_weekplanning": False
                 }
             }
         
@@ -156,15 +212,34 @@ class HybridPlanningAlgorithm:
             reader = csv.DictReader(f)
             self.spelers = list(reader)
         
+        self._bereid_speler_kenmerken_voor()
         self._bouw_voorkeur_mappings()
+        self._score_cache = {}
         print(f"Geladen: {len(self.spelers)} spelers")
         print(f"SamenMet voorkeuren gevonden voor {len(self.samen_met_voorkeuren)} spelers")
     
     def laad_banen(self, bestand_pad):
         """Laad baanbeschikbaarheid uit CSV bestand"""
         with open(bestand_pad, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            self.banen = [row for row in reader if row['Beschikbaar'].lower() == 'true']
+            # Positioneel lezen en filteren op Beschikbaar; alleen beschikbare rijen worden een dict
+            reader = csv.reader(f)
+            kolommen = next(reader, [])
+            beschikbaar_kolom = kolommen.index('Beschikbaar') if kolommen else 0
+            self.banen = [dict(zip(kolommen, row)) for row in reader
+                          if row and row[beschikbaar_kolom].lower() == 'true']
+        
+        # Eenmalig normaliseren zodat planning loops niet per baan hoeven te parsen
+        self._banen_per_dag = defaultdict(list)
+        self._banen_per_dag_slot = defaultdict(dict)
+        self._banen_per_slot = defaultdict(list)
+        self._banen_per_locatie = defaultdict(list)
+        for baan in self.banen:
+            baan['_dag'] = baan['Dag'].capitalize()
+            baan['_tijd_masker'] = self._tijdslot_masker(baan['Tijdslot'])
+            self._banen_per_dag[baan['_dag']].append(baan)
+            self._banen_per_dag_slot[baan['_dag']].setdefault((baan['Locatie'], baan['Tijdslot']), []).append(baan)
+            self._banen_per_slot[(baan['Dag'], baan['Locatie'], baan['Tijdslot'])].append(baan)
+            self._banen_per_locatie[baan['Locatie']].append(baan)
         print(f"Geladen: {len(self.banen)} beschikbare baantijden")
     
     def laad_trainers(self, bestand_pad):
@@ -178,9 +253,80 @@ class HybridPlanningAlgorithm:
             print(f"Waarschuwing: Trainer beschikbaarheidsbestand niet gevonden op {bestand_pad}")
             self.trainers_beschikbaarheid = []
 
+    def _bereid_speler_kenmerken_voor(self):
+        """Parse niveau, geslacht, leeftijd en beschikbaarheid eenmalig naar getypeerde velden op elke speler"""
+        dame_bonus = self.gender_compensatie['dame_niveau_bonus']
+        self._spelers_per_locatie = defaultdict(list)
+        self._spelers_per_slot = {}
+        self._beschikbare_spelers_per_slot = {}
+        for speler in self.spelers:
+            self._spelers_per_locatie[speler['LocatieVoorkeur']].append(speler)
+            
+            # Niveau: None als onbekend, anders float
+            try:
+                niveau = float(speler['Niveau']) if speler.get('Niveau') else None
+            except (ValueError, TypeError):
+                niveau = None
+            speler['_niveau'] = niveau
+            
+            geslacht = speler.get('Geslacht')
+            speler['_is_man'] = geslacht in MANNELIJKE_GESLACHTEN
+            speler['_is_vrouw'] = geslacht in VROUWELIJKE_GESLACHTEN
+            
+            # Gecorrigeerd niveau (0.0 = geen geldig niveau)
+            if not niveau:
+                speler['_gecorrigeerd_niveau'] = 0.0
+            elif speler['_is_vrouw']:
+                speler['_gecorrigeerd_niveau'] = niveau + dame_bonus
+            else:
+                speler['_gecorrigeerd_niveau'] = niveau
+            
+            try:
+                speler['_leeftijd'] = int(speler.get('Leeftijd', ''))
+            except (ValueError, TypeError):
+                speler['_leeftijd'] = None
+            speler['_leeftijd_categorie'] = self._bepaal_leeftijd_categorie(speler['_leeftijd'])
+            
+            # Wil in de huidige (legacy) groep blijven
+            speler['_blijft_in_groep'] = (speler.get('BlijftInHuidigeGroep', '') or '').lower() == 'ja'
+            
+            # Volledige naam voor groepsomschrijvingen
+            speler['_volledige_naam'] = f"{speler['Voornaam']} {speler['Achternaam']}"
+            
+            # Regel voor het rapport van niet-ingeplande spelers
+            speler['_rapport_regel'] = {
+                'SpelerID': speler['SpelerID'],
+                'Naam': speler['_volledige_naam'],
+                'LocatieVoorkeur': speler['LocatieVoorkeur'],
+                'Niveau': speler['Niveau']
+            }
+            
+            # Beschikbaarheid per dag als bitmasker
+            speler['_tijd_maskers'] = {
+                dag: self._tijdslots_naar_masker(self.parse_tijdslot(speler.get(dag, '')))
+                for dag in self.dag_mapping
+            }
+
+    def _bepaal_leeftijd_categorie(self, leeftijd):
+        """Bepaal leeftijdscategorie (jong/middel/senior/overig), None als leeftijd onbekend is"""
+        if leeftijd is None:
+            return None
+        jong_min, jong_max = self.leeftijdsgroepen["jong"]
+        middel_min, middel_max = self.leeftijdsgroepen["middel"]
+        senior_min, senior_max = self.leeftijdsgroepen["senior"]
+        
+        if jong_min <= leeftijd < jong_max:
+            return "jong"
+        elif middel_min <= leeftijd < middel_max:
+            return "middel"
+        elif senior_min <= leeftijd <= senior_max:
+            return "senior"
+        return "overig"
+
     def _bouw_voorkeur_mappings(self):
         """Bouw de voorkeur mappings voor SamenMet functionaliteit"""
         self.samen_met_voorkeuren = {}
+        self.samen_met_voorkeuren_ids = {}
         self.speler_naam_naar_id = {}
         self.dangling_wishes = 0  # Tel wensen naar niet-bestaande spelers
 
@@ -206,9 +352,41 @@ class HybridPlanningAlgorithm:
                         self.dangling_wishes += 1
                 if filtered_partners:
                     self.samen_met_voorkeuren[speler['SpelerID']] = set(filtered_partners)
+                    self.samen_met_voorkeuren_ids[speler['SpelerID']] = frozenset(
+                        self.speler_naam_naar_id[naam] for naam in filtered_partners)
+
+        # Partner bitmaps: bit i staat aan als de speler speler i (index in self.spelers) als partner wil
+        indices_per_naam = defaultdict(list)
+        self._indices_per_speler_id = defaultdict(list)
+        self._speler_per_norm_naam = {}
+        for index, speler in enumerate(self.spelers):
+            speler['_index'] = index
+            self._indices_per_speler_id[speler['SpelerID']].append(index)
+            speler['_norm_naam'] = self.normalize_name(speler['_volledige_naam'])
+            self._speler_per_norm_naam.setdefault(speler['_norm_naam'], speler)
+            indices_per_naam[speler['_norm_naam']].append(index)
+        for speler in self.spelers:
+            partner_bits = 0
+            # Spelers zonder geldige naam tellen niet mee in SamenMet scoring
+            if speler['_norm_naam'] in self.speler_naam_naar_id:
+                for naam in self.samen_met_voorkeuren.get(speler['SpelerID'], ()):
+                    for index in indices_per_naam.get(naam, ()):
+                        partner_bits |= 1 << index
+            speler['_partner_bits'] = partner_bits
+            # Spelers met SamenMet voorkeuren zijn niet aan hun eigen locatie gebonden
+            speler['_locatie_flexibel'] = speler['SpelerID'] in self.samen_met_voorkeuren
     
     def calculate_group_quality_score(self, groep: List[Dict], locatie: str = None) -> float:
-        """Bereken groepskwaliteitsscore met nieuwe scoring systeem"""
+        """Bereken groepskwaliteitsscore met nieuwe scoring systeem (gecached per samenstelling en locatie)"""
+        sleutel = (tuple(sorted(s['_index'] for s in groep)), locatie)
+        score = self._score_cache.get(sleutel)
+        if score is None:
+            score = self._bereken_groepskwaliteit(groep, locatie)
+            self._score_cache[sleutel] = score
+        return score
+
+    def _bereken_groepskwaliteit(self, groep: List[Dict], locatie: str = None) -> float:
+        """Bereken groepskwaliteitsscore zonder cache; de score hangt niet af van de volgorde van spelers"""
         if len(groep) != self.planning_parameters['spelers_per_groep']:
             return 0.0
         
@@ -225,9 +403,34 @@ class HybridPlanningAlgorithm:
         else:
             return self._bereken_nieuwe_groep_score(groep)
     
+    def _bepaal_maximale_groepsscore(self) -> float:
+        """Bepaal een bovengrens voor calculate_group_quality_score op basis van de scoring configuratie"""
+        scoring = self.nieuwe_groep_scoring
+        
+        def max_component(naam):
+            return max([0.0, *scoring[naam]['scores'].values()])
+        
+        overige_max = (max_component('niveau_homogeniteit') + max_component('geslachtsbalans') +
+                       max_component('leeftijdsmatch'))
+        samen_met_max = max(0.0, scoring['samen_met_voorkeur'].get('max_punten', 4.0))
+        bovengrens = min(overige_max + samen_met_max, 10.0)
+        
+        # Legacy groepen: volledige score, of basis plus (deel van) de resterende punten
+        legacy = self.legacy_scoring
+        bovengrens = max(bovengrens, legacy['volledige_legacy_score'])
+        maximaal_haalbare_punten = (scoring['niveau_homogeniteit']['max_punten'] +
+                                    scoring['geslachtsbalans']['max_punten'] +
+                                    scoring['leeftijdsmatch']['max_punten'])
+        for sleutel, basis_score in legacy['gedeeltelijke_legacy_basis'].items():
+            legacy_max = basis_score
+            if maximaal_haalbare_punten > 0:
+                legacy_max = max(basis_score, basis_score + overige_max / maximaal_haalbare_punten * legacy['resterende_punten'][sleutel])
+            bovengrens = max(bovengrens, min(legacy_max, 10.0))
+        return bovengrens
+    
     def _voldoet_aan_harde_filters(self, groep: List[Dict], locatie: str = None) -> bool:
         """Check of groep voldoet aan alle harde filters"""
-        harde_filters = self.config['harde_filters']
+        harde_filters = self.harde_filters
         
         # 1. Groepsgrootte
         if len(groep) != harde_filters['groepsgrootte']:
@@ -241,10 +444,8 @@ class HybridPlanningAlgorithm:
                     return False
         
         # 3. Niveau verschil
-        niveaus = [self._get_gecorrigeerd_niveau(s) for s in groep]
-        
         # Check alleen als er geldige niveaus zijn
-        geldige_niveaus = [n for n in niveaus if n > 0]
+        geldige_niveaus = [s['_gecorrigeerd_niveau'] for s in groep if s['_gecorrigeerd_niveau'] > 0]
         if len(geldige_niveaus) > 1:
             niveau_verschil = max(geldige_niveaus) - min(geldige_niveaus)
             if niveau_verschil > harde_filters['max_niveau_verschil']:
@@ -266,18 +467,18 @@ class HybridPlanningAlgorithm:
     def _bepaal_legacy_status(self, groep: List[Dict]) -> Dict:
         """Bepaal of dit een legacy groep is en hoeveel spelers blijven"""
         # Voor nu: simpele implementatie - check of spelers "BlijftInHuidigeGroep" hebben
-        blijvende_spelers = [s for s in groep if s.get('BlijftInHuidigeGroep', '').lower() == 'ja']
+        aantal_blijvend = sum(1 for s in groep if s['_blijft_in_groep'])
         
         return {
-            'is_legacy': len(blijvende_spelers) >= 2,
-            'aantal_blijvend': len(blijvende_spelers),
+            'is_legacy': aantal_blijvend >= 2,
+            'aantal_blijvend': aantal_blijvend,
             'totaal_origineel': 4,  # Voor nu aanname van 4
             'groep': groep  # Voeg de groep toe voor scoring berekening
         }
     
     def _bereken_legacy_score(self, legacy_info: Dict) -> float:
         """Bereken score voor legacy groepen"""
-        legacy_scoring = self.config['legacy_scoring']
+        legacy_scoring = self.legacy_scoring
         
         if legacy_info['aantal_blijvend'] == 4:
             score = legacy_scoring['volledige_legacy_score']
@@ -300,7 +501,7 @@ class HybridPlanningAlgorithm:
             return basis_score
         
         # Bereken score voor de overige componenten (zonder SamenMet voorkeuren)
-        scoring = self.config['nieuwe_groep_scoring']
+        scoring = self.nieuwe_groep_scoring
         
         # 1. Niveau homogeniteit
         niveau_score = self._bereken_niveau_score(groep, scoring['niveau_homogeniteit'])
@@ -329,7 +530,7 @@ class HybridPlanningAlgorithm:
     
     def _bereken_nieuwe_groep_score(self, groep: List[Dict]) -> float:
         """Bereken score voor nieuwe groepen"""
-        scoring = self.config['nieuwe_groep_scoring']
+        scoring = self.nieuwe_groep_scoring
         totaal_score = 0.0
         
         # 1. Niveau homogeniteit
@@ -348,20 +549,16 @@ class HybridPlanningAlgorithm:
     
     def _bereken_niveau_score(self, groep: List[Dict], scoring_config: Dict) -> float:
         """Bereken niveau homogeniteit score"""
-        niveaus = [self._get_gecorrigeerd_niveau(s) for s in groep]
-        geldige_niveaus = [n for n in niveaus if n > 0]
+        geldige_niveaus = [s['_gecorrigeerd_niveau'] for s in groep if s['_gecorrigeerd_niveau'] > 0]
 
         if not geldige_niveaus:
             return 0.0
         
-        if len(set(geldige_niveaus)) == 1:
+        niveau_counts = Counter(geldige_niveaus)
+        if len(niveau_counts) == 1:
             return scoring_config['scores']['zelfde_niveau']
-        elif len(set(geldige_niveaus)) == 2:
+        elif len(niveau_counts) == 2:
             # Check of het 2+2 mix is
-            niveau_counts = {}
-            for niveau in geldige_niveaus:
-                niveau_counts[niveau] = niveau_counts.get(niveau, 0) + 1
-            
             if all(count == 2 for count in niveau_counts.values()):
                 return scoring_config['scores']['2_plus_2_mix']
         
@@ -369,31 +566,26 @@ class HybridPlanningAlgorithm:
     
     def _bereken_samen_met_score(self, groep: List[Dict], scoring_config: Dict) -> float:
         """Bereken SamenMet voorkeur score: alleen wensen naar bestaande spelers tellen mee (geen bonus/geen straf voor niet-bestaande partners)"""
-        groep_ids = {s['SpelerID'] for s in groep}
-        norm_namen = {s['SpelerID']: self.normalize_name(f"{s['Voornaam']} {s['Achternaam']}") for s in groep}
         baseline = 2.0
-        score = baseline
-        paren = set()
-        # Verzamel alle unieke paren (A,B) met A < B
+        max_punten = scoring_config.get('max_punten', 4.0)
+        # Niemand in de groep heeft (geldige) voorkeuren: alleen de baseline
+        if not any(s['_partner_bits'] for s in groep):
+            return max(0.0, min(baseline, max_punten))
+        wederzijds = 0
+        eenzijdig = 0
+        # Loop over alle unieke paren (A,B) in de groep
         for i, speler_a in enumerate(groep):
-            for j, speler_b in enumerate(groep):
-                if i < j:
-                    paren.add((speler_a['SpelerID'], speler_b['SpelerID']))
-        for a_id, b_id in paren:
-            a_voorkeuren = self.samen_met_voorkeuren.get(a_id, set())
-            b_voorkeuren = self.samen_met_voorkeuren.get(b_id, set())
-            a_naam = norm_namen[a_id]
-            b_naam = norm_namen[b_id]
-            # Controleer of beide spelers bestaan (in de dataset)
-            if b_naam not in self.speler_naam_naar_id or a_naam not in self.speler_naam_naar_id:
-                continue  # negeer wensen naar niet-bestaande spelers
-            a_wil_b = b_naam in a_voorkeuren
-            b_wil_a = a_naam in b_voorkeuren
-            if a_wil_b and b_wil_a:
-                score += 1.2  # wederzijds vervuld
-            elif a_wil_b or b_wil_a:
-                score += 0.6  # eenzijdig vervuld
-        score = max(0.0, min(score, scoring_config.get('max_punten', 4.0)))
+            a_bits = speler_a['_partner_bits']
+            a_index = speler_a['_index']
+            for speler_b in groep[i + 1:]:
+                a_wil_b = (a_bits >> speler_b['_index']) & 1
+                b_wil_a = (speler_b['_partner_bits'] >> a_index) & 1
+                if a_wil_b and b_wil_a:
+                    wederzijds += 1  # wederzijds vervuld
+                elif a_wil_b or b_wil_a:
+                    eenzijdig += 1  # eenzijdig vervuld
+        score = baseline + 1.2 * wederzijds + 0.6 * eenzijdig
+        score = max(0.0, min(score, max_punten))
         return score
     
     def _bereken_oude_samen_met_score(self, groep: List[Dict]) -> float:
@@ -403,48 +595,40 @@ class HybridPlanningAlgorithm:
     
     def _bereken_geslacht_score(self, groep: List[Dict], scoring_config: Dict) -> float:
         """Bereken geslachtsbalans score"""
-        mannen = sum(1 for s in groep if s['Geslacht'] in ['M', 'Man', 'Jongen'])
-        vrouwen = len(groep) - mannen
-        
-        if mannen == 4:
-            return scoring_config['scores']['homogeen_4m']
-        elif vrouwen == 4:
-            return scoring_config['scores']['homogeen_4v']
-        elif mannen == 2 and vrouwen == 2:
-            return scoring_config['scores']['perfect_2m_2v']
-        elif mannen == 3 or vrouwen == 3:
-            return scoring_config['scores']['drie_een']
-        
-        return 0.0
+        mannen = sum(1 for s in groep if s['_is_man'])
+        return self._geslacht_score_tabel(scoring_config, len(groep))[mannen]
+    
+    def _geslacht_score_tabel(self, scoring_config: Dict, groepsgrootte: int) -> Tuple[float, ...]:
+        """Geef (gecachte) geslachtsbalans scores per aantal mannen voor een groepsgrootte"""
+        sleutel = (id(scoring_config), groepsgrootte)
+        tabel = self._geslacht_score_tabellen.get(sleutel)
+        if tabel is None:
+            scores = []
+            for mannen in range(groepsgrootte + 1):
+                vrouwen = groepsgrootte - mannen
+                if mannen == 4:
+                    scores.append(scoring_config['scores']['homogeen_4m'])
+                elif vrouwen == 4:
+                    scores.append(scoring_config['scores']['homogeen_4v'])
+                elif mannen == 2 and vrouwen == 2:
+                    scores.append(scoring_config['scores']['perfect_2m_2v'])
+                elif mannen == 3 or vrouwen == 3:
+                    scores.append(scoring_config['scores']['drie_een'])
+                else:
+                    scores.append(0.0)
+            tabel = tuple(scores)
+            self._geslacht_score_tabellen[sleutel] = tabel
+        return tabel
     
     def _bereken_leeftijd_score(self, groep: List[Dict], scoring_config: Dict) -> float:
         """Bereken leeftijdsmatch score"""
-        leeftijden = []
-        for speler in groep:
-            try:
-                leeftijd = int(speler.get('Leeftijd', ''))
-                leeftijden.append(leeftijd)
-            except (ValueError, TypeError):
-                continue
+        categorieen = [s['_leeftijd_categorie'] for s in groep if s['_leeftijd_categorie'] is not None]
         
-        if len(leeftijden) < 4:
+        if len(categorieen) < 4:
             return 0.0
         
         # Groepeer leeftijden
-        groepen = set()
-        for l in leeftijden:
-            jong_min, jong_max = self.leeftijdsgroepen["jong"]
-            middel_min, middel_max = self.leeftijdsgroepen["middel"]
-            senior_min, senior_max = self.leeftijdsgroepen["senior"]
-            
-            if jong_min <= l < jong_max:
-                groepen.add("jong")
-            elif middel_min <= l < middel_max:
-                groepen.add("middel")
-            elif senior_min <= l <= senior_max:
-                groepen.add("senior")
-            else:
-                groepen.add("overig")
+        groepen = set(categorieen)
         
         if len(groepen) == 1:
             return scoring_config['scores']['zelfde_categorie']
@@ -455,54 +639,42 @@ class HybridPlanningAlgorithm:
     
     def _bereken_voorkeur_score(self, groep: List[Dict]) -> float:
         """Bereken SamenMet voorkeuren score (oude methode voor backwards compatibility)"""
-        groep_namen = set()
-        for speler in groep:
-            voornaam = (speler.get('Voornaam', '') or '').strip()
-            achternaam = (speler.get('Achternaam', '') or '').strip()
-            if voornaam and achternaam:
-                groep_namen.add(f"{voornaam} {achternaam}".lower())
+        groep_ids = {s['SpelerID'] for s in groep}
         
         vervulde_voorkeuren = 0
         totale_voorkeuren = 0
         
         for speler in groep:
-            if speler['SpelerID'] in self.samen_met_voorkeuren:
-                partners = self.samen_met_voorkeuren[speler['SpelerID']]
+            partners = self.samen_met_voorkeuren_ids.get(speler['SpelerID'])
+            if partners:
                 totale_voorkeuren += len(partners)
-                vervulde_voorkeuren += sum(1 for partner in partners if partner in groep_namen)
+                vervulde_voorkeuren += len(partners & groep_ids)
         
         return vervulde_voorkeuren / totale_voorkeuren if totale_voorkeuren > 0 else 0.0
     
     def _bereken_gender_niveau_compensatie(self, groep: List[Dict]) -> float:
         """Bereken niveau compensatie"""
-        mannen = [s for s in groep if s['Geslacht'] in ['M', 'Man', 'Jongen']]
-        vrouwen = [s for s in groep if s['Geslacht'] in ['V', 'Vrouw', 'Meisje']]
-        
-        if len(mannen) == 0 or len(vrouwen) == 0:
+        niveau_scores = self.config["niveau_scores"]
+        is_gemengd = any(s['_is_man'] for s in groep) and any(s['_is_vrouw'] for s in groep)
+        
+        if is_gemengd:
+            # Gemengde groep - gender compensatie uit configuratie
+            dame_bonus = self.gender_compensatie['dame_niveau_bonus']
+            niveaus = ([s['_niveau'] for s in groep if s['_is_man'] and s['_niveau'] is not None] +
+                       [s['_niveau'] + dame_bonus for s in groep if s['_is_vrouw'] and s['_niveau'] is not None])
+        else:
             # Homogene groep
-            niveaus = [float(s['Niveau']) for s in groep if s['Niveau']]
-            if not niveaus:
-                return self.config["niveau_scores"]["slechte_niveau_match"]
-            verschil = max(niveaus) - min(niveaus)
-            if verschil == 0:
-                return self.config["niveau_scores"]["perfect_niveau_match"]
-            elif verschil <= self.optimalisatie_instellingen['max_niveau_verschil']:
-                return self.config["niveau_scores"]["goede_niveau_match"]
-            else:
-                return self.config["niveau_scores"]["slechte_niveau_match"]
+            niveaus = [s['_niveau'] for s in groep if s['_niveau'] is not None]
         
-        # Gemengde groep - gender compensatie uit configuratie
-        niveaus = ([float(m['Niveau']) for m in mannen if m['Niveau']] + 
-                  [float(v['Niveau']) + self.gender_compensatie['dame_niveau_bonus'] for v in vrouwen if v['Niveau']])
         if not niveaus:
-            return self.config["niveau_scores"]["slechte_niveau_match"]
+            return niveau_scores["slechte_niveau_match"]
         verschil = max(niveaus) - min(niveaus)
         if verschil == 0:
-            return self.config["niveau_scores"]["perfect_niveau_match"]
+            return niveau_scores["perfect_niveau_match"]
         elif verschil <= self.optimalisatie_instellingen['max_niveau_verschil']:
-            return self.config["niveau_scores"]["goede_niveau_match"]
+            return niveau_scores["goede_niveau_match"]
         else:
-            return self.config["niveau_scores"]["slechte_niveau_match"]
+            return niveau_scores["slechte_niveau_match"]
 
     def parse_tijdslot(self, tijdslot_str):
         """Parse tijdslot string"""
@@ -522,15 +694,6 @@ class HybridPlanningAlgorithm:
     
     def tijden_overlappen(self, slot1, slot2):
         """Check tijdslot overlap"""
-        def tijd_naar_minuten(tijd_str):
-            if not tijd_str or ':' not in tijd_str or not tijd_str.replace(':','').isdigit():
-                return None
-            try:
-                uur, minuut = map(int, tijd_str.split(':'))
-                return uur * 60 + minuut
-            except Exception:
-                return None
-        
         start1, eind1 = slot1
         start2, eind2 = slot2
         start1_min, eind1_min = tijd_naar_minuten(start1), tijd_naar_minuten(eind1)
@@ -539,38 +702,64 @@ class HybridPlanningAlgorithm:
             return False
         return (start1_min < eind2_min) and (start2_min < eind1_min)
 
+    def _tijdslots_naar_masker(self, slots) -> int:
+        """Zet (start, eind) tijdslots om naar een bitmasker met één bit per minuut van de dag.
+        
+        Voor geldige intervallen (start < eind) overlappen twee maskers precies dan als tijden_overlappen True geeft.
+        Ongeldige tijden en lege of omgekeerde intervallen (start >= eind) leveren geen bits op; daar kan
+        tijden_overlappen wel overlap melden, dus voor zulke intervallen wijken de twee af.
+        """
+        masker = 0
+        for start, eind in slots:
+            start_min, eind_min = tijd_naar_minuten(start), tijd_naar_minuten(eind)
+            if start_min is None or eind_min is None or start_min >= eind_min:
+                continue
+            masker |= ((1 << eind_min) - 1) ^ ((1 << start_min) - 1)
+        return masker
+
+    def _tijdslot_masker(self, tijdslot_str: str) -> int:
+        """Geef het (gecachte) bitmasker van een 'HH:MM-HH:MM' tijdslot"""
+        masker = self._tijdslot_maskers.get(tijdslot_str)
+        if masker is None:
+            try:
+                start, eind = tijdslot_str.split('-')
+                masker = self._tijdslots_naar_masker([(start, eind)])
+            except ValueError:
+                masker = 0
+            self._tijdslot_maskers[tijdslot_str] = masker
+        return masker
+
     def optimize_groups_in_slot(self, spelers: List[Dict], max_groepen: int, locatie: str = None) -> List[List[Dict]]:
         """Optimaliseer groepsvorming in tijdslot"""
         if len(spelers) < 4:
             return []
         
-        mannen = [s for s in spelers if s['Geslacht'] in ['M', 'Man', 'Jongen']]
-        vrouwen = [s for s in spelers if s['Geslacht'] in ['V', 'Vrouw', 'Meisje']]
-        
-        mannen.sort(key=lambda x: float(x['Niveau']) if x['Niveau'] else 0)
-        vrouwen.sort(key=lambda x: float(x['Niveau']) if x['Niveau'] else 0)
+        # Eén pass over de spelers met de vooraf bepaalde geslachtsvlaggen
+        mannen = []
+        vrouwen = []
+        for s in spelers:
+            if s['_is_man']:
+                mannen.append(s)
+            elif s['_is_vrouw']:
+                vrouwen.append(s)
+        
+        mannen.sort(key=lambda x: x['_niveau'] or 0)
+        vrouwen.sort(key=lambda x: x['_niveau'] or 0)
 
         # Maak homogene groepen
-        alle_groepen = []
-        alle_groepen.extend(self.create_optimized_homogene_groups(mannen, max_groepen // 2, locatie))
+        alle_groepen = self.create_optimized_homogene_groups(mannen, max_groepen // 2, locatie)
         
-        # Verwijder gebruikte spelers
-        gebruikt = set()
-        for groep in alle_groepen:
-            for speler in groep:
-                gebruikt.add(speler['SpelerID'])
-        
-        resterende_mannen = [m for m in mannen if m['SpelerID'] not in gebruikt]
+        # Verwijder gebruikte spelers op SpelerID: twee spelerregels kunnen hetzelfde SpelerID delen,
+        # en een ID mag per week maar in één groep terechtkomen
+        gebruikt = {speler['SpelerID'] for groep in alle_groepen for speler in groep}
         resterende_vrouwen = [v for v in vrouwen if v['SpelerID'] not in gebruikt]
         
-        alle_groepen.extend(self.create_optimized_homogene_groups(resterende_vrouwen, max_groepen - len(alle_groepen), locatie))
-
-        # Verwijder meer gebruikte spelers
-        for groep in alle_groepen:
-            for speler in groep:
-                gebruikt.add(speler['SpelerID'])
+        vrouwen_groepen = self.create_optimized_homogene_groups(resterende_vrouwen, max_groepen - len(alle_groepen), locatie)
+        alle_groepen.extend(vrouwen_groepen)
         
-        resterende_mannen = [m for m in resterende_mannen if m['SpelerID'] not in gebruikt]
+        # Verwijder meer gebruikte spelers
+        gebruikt.update(speler['SpelerID'] for groep in vrouwen_groepen for speler in groep)
+        resterende_mannen = [m for m in mannen if m['SpelerID'] not in gebruikt]
         resterende_vrouwen = [v for v in vrouwen if v['SpelerID'] not in gebruikt]
         
         # Maak gemengde groepen
@@ -583,9 +772,10 @@ class HybridPlanningAlgorithm:
             if score > 0.0:  # Alleen groepen die voldoen aan harde filters
                 groepen_met_scores.append((groep, score))
         
-        groepen_met_scores.sort(key=lambda x: x[1], reverse=True)
+        # Alleen de beste max_groepen zijn nodig (zelfde volgorde als een stabiele aflopende sortering)
+        beste = heapq.nlargest(max_groepen, groepen_met_scores, key=lambda x: x[1])
         
-        return [groep for groep, _ in groepen_met_scores[:max_groepen]]
+        return [groep for groep, _ in beste]
     
     def create_optimized_homogene_groups(self, spelers: List[Dict], max_groepen: int, locatie: str = None) -> List[List[Dict]]:
         """Maak geoptimaliseerde homogene groepen met niveau-optimalisatie"""
@@ -593,7 +783,7 @@ class HybridPlanningAlgorithm:
             return []
         
         groepen = []
-        spelers_sorted = sorted(spelers, key=lambda x: float(x['Niveau']) if x['Niveau'] else 0)
+        spelers_sorted = sorted(spelers, key=lambda x: x['_niveau'] or 0)
         
         # Genereer alle mogelijke combinaties en evalueer ze
         while len(spelers_sorted) >= self.planning_parameters['spelers_per_groep'] and len(groepen) < max_groepen:
@@ -605,90 +795,131 @@ class HybridPlanningAlgorithm:
             max_kandidaten = min(self.optimalisatie_instellingen['max_kandidaten_per_homogene_groep'], len(spelers_sorted))
             kandidaten = spelers_sorted[:max_kandidaten]
             
-            for groep in itertools.combinations(kandidaten, self.planning_parameters['spelers_per_groep']):
-                groep_list = list(groep)
-                niveaus = [float(s['Niveau']) for s in groep_list if s['Niveau']]
-                
-                # Alleen groepen met max niveau verschil - nu configureerbaar
-                if niveaus and max(niveaus) - min(niveaus) <= self.optimalisatie_instellingen['max_niveau_verschil']:
-                    score = self.calculate_group_quality_score(groep_list, locatie)
-                    if score > 0.0 and score > beste_score:  # Alleen groepen met score > 0
-                        beste_score = score
-                        beste_groep = groep_list
+            # Alleen groepen met max niveau verschil - nu configureerbaar
+            for groep_list in self._combinaties_binnen_niveau_verschil(
+                    kandidaten, self.planning_parameters['spelers_per_groep'],
+                    self.optimalisatie_instellingen['max_niveau_verschil']):
+                score = self.calculate_group_quality_score(groep_list, locatie)
+                if score > 0.0 and score > beste_score:  # Alleen groepen met score > 0
+                    beste_score = score
+                    beste_groep = groep_list
+                    if beste_score >= self.maximale_groepsscore:
+                        break  # Geen enkele volgende combinatie kan deze score nog overtreffen
             
             if beste_groep:
                 groepen.append(beste_groep)
-                # Verwijder gebruikte spelers
-                for speler in beste_groep:
-                    if speler in spelers_sorted:
-                        spelers_sorted.remove(speler)
+                # Verwijder gebruikte spelers (één pass op index i.p.v. list.remove met dict vergelijkingen)
+                gekozen = {s['_index'] for s in beste_groep}
+                spelers_sorted = [s for s in spelers_sorted if s['_index'] not in gekozen]
             else:
                 # Geen geldige groep meer mogelijk
                 break
         
         return groepen
 
+    def _combinaties_binnen_niveau_verschil(self, kandidaten: List[Dict], grootte: int, max_verschil: float):
+        """Genereer combinaties van op niveau gesorteerde kandidaten met niveau verschil <= max_verschil.
+        
+        Levert dezelfde groepen in dezelfde volgorde als itertools.combinations gevolgd door het niveau filter,
+        maar kapt een tak af zodra het verschil te groot wordt (latere kandidaten hebben een hoger niveau).
+        Spelers zonder niveau tellen niet mee voor het verschil; groepen zonder enig niveau worden overgeslagen.
+        """
+        n = len(kandidaten)
+        niveaus = [k['_niveau'] for k in kandidaten]
+        # Iteratieve diepte-eerst zoektocht (zonder geneste generators): gekozen bevat de indices van de
+        # huidige deelgroep, grenzen[d] het (laagste, hoogste) niveau na d keuzes
+        gekozen = []
+        grenzen = [(None, None)]
+        x = 0
+        while True:
+            diepte = len(gekozen)
+            if diepte == grootte:
+                if grenzen[diepte][0] is not None:
+                    yield [kandidaten[i] for i in gekozen]
+                terug = True
+            elif x > n - (grootte - diepte):
+                terug = True  # Niet genoeg kandidaten meer over op deze diepte
+            else:
+                niveau = niveaus[x]
+                laagste, hoogste = grenzen[diepte]
+                terug = False
+                if niveau is not None:
+                    laagste = niveau if laagste is None or niveau < laagste else laagste
+                    hoogste = niveau if hoogste is None or niveau > hoogste else hoogste
+                    if hoogste - laagste > max_verschil:
+                        if niveau > 0:
+                            terug = True  # Alle volgende kandidaten hebben een niveau >= dit niveau
+                        else:
+                            x += 1
+                            continue
+                if not terug:
+                    gekozen.append(x)
+                    grenzen.append((laagste, hoogste))
+                    x += 1
+                    continue
+            # Terug naar de vorige diepte en daar de volgende kandidaat proberen
+            if not gekozen:
+                return
+            x = gekozen.pop() + 1
+            grenzen.pop()
+
     def _maak_gemengde_groepen(self, mannen: List[Dict], vrouwen: List[Dict], max_groepen: int, locatie: str = None) -> List[List[Dict]]:
         """Maak gemengde groepen"""
         if len(mannen) < 2 or len(vrouwen) < 2 or max_groepen == 0:
             return []
         
         groepen = []
-        mannen_per_niveau = defaultdict(list)
-        vrouwen_per_niveau = defaultdict(list)
-        
-        for man in mannen:
-            if man['Niveau']:
-                niveau = float(man['Niveau'])
-                mannen_per_niveau[niveau].append(man)
-        for vrouw in vrouwen:
-            if vrouw['Niveau']:
-                niveau = float(vrouw['Niveau'])
-                vrouwen_per_niveau[niveau].append(vrouw)
-        
-        for vrouw_niveau in sorted(vrouwen_per_niveau.keys()):
+        mannen_per_niveau = self._groepeer_op_niveau(mannen)
+        vrouwen_per_niveau = self._groepeer_op_niveau(vrouwen)
+        
+        # Per niveau bucket wijst een pointer naar de eerste nog niet ingedeelde speler (geen list slicing)
+        mannen_start = defaultdict(int)
+        for vrouw_niveau in vrouwen_per_niveau:
             if len(groepen) >= max_groepen:
-                            break
-                    
+                break
+            
             beschikbare_vrouwen = vrouwen_per_niveau[vrouw_niveau]
+            v = 0
             if len(beschikbare_vrouwen) < 2:
                 continue
             
             for man_niveau in [vrouw_niveau + self.gender_compensatie['dame_niveau_bonus'], vrouw_niveau]:
                 if len(groepen) >= max_groepen:
-                            break 
-                    
+                    break
+                
                 beschikbare_mannen = mannen_per_niveau.get(man_niveau, [])
-                if len(beschikbare_mannen) < 2:
+                m = mannen_start[man_niveau]
+                if len(beschikbare_mannen) - m < 2:
                     continue
                 
-                while (len(beschikbare_mannen) >= 2 and len(beschikbare_vrouwen) >= 2 and 
+                while (len(beschikbare_mannen) - m >= 2 and len(beschikbare_vrouwen) - v >= 2 and 
                        len(groepen) < max_groepen):
                     
-                    groep = beschikbare_mannen[:2] + beschikbare_vrouwen[:2]
+                    groep = beschikbare_mannen[m:m + 2] + beschikbare_vrouwen[v:v + 2]
                     # Alleen groepen met score > 0 (die voldoen aan harde filters)
                     score = self.calculate_group_quality_score(groep, locatie)
                     if score > 0.0:
                         groepen.append(groep)
-                        beschikbare_mannen = beschikbare_mannen[2:]
-                        beschikbare_vrouwen = beschikbare_vrouwen[2:]
-                        mannen_per_niveau[man_niveau] = beschikbare_mannen
-                        vrouwen_per_niveau[vrouw_niveau] = beschikbare_vrouwen
+                        m += 2
+                        v += 2
                     else:
                         break
+                mannen_start[man_niveau] = m
                         
         return groepen
 
+    @staticmethod
+    def _groepeer_op_niveau(spelers: List[Dict]) -> Dict[float, List[Dict]]:
+        """Groepeer spelers met een niveau per niveau, oplopend op niveau en binnen een niveau in invoervolgorde"""
+        met_niveau = sorted((s for s in spelers if s['_niveau'] is not None), key=itemgetter('_niveau'))
+        return {niveau: list(groep) for niveau, groep in groupby(met_niveau, key=itemgetter('_niveau'))}
+
     def vind_matches(self, dag, week_nummer):
         """Vind matches voor een dag"""
         dag_key = dag.capitalize()
         
-        # Groepeer banen per locatie/tijdslot
-        baan_objecten_per_slot = defaultdict(list)
-        for baan in self.banen:
-            if baan['Dag'].capitalize() == dag_key:
-                slot_key = (baan['Locatie'], baan['Tijdslot'])
-                baan_objecten_per_slot[slot_key].append(baan)
+        # Banen per locatie/tijdslot (eenmalig gegroepeerd in laad_banen)
+        baan_objecten_per_slot = self._banen_per_dag_slot.get(dag_key, {})
         
         matches = []
         if week_nummer not in self.ingeplande_spelers_per_week:
@@ -703,26 +934,19 @@ class HybridPlanningAlgorithm:
                 tijdslot_start, tijdslot_eind = tijdslot_str.split('-')
             except ValueError:
                 continue
+            slot_masker = banen_lijst[0]['_tijd_masker']
 
-            # Verzamel beschikbare spelers
-            beschikbare_spelers = []
-            for speler in self.spelers:
-                if speler['SpelerID'] in ingeplande_ids:
-                    continue
-                
-                # Check tijdbeschikbaarheid
-                speler_tijden = self.parse_tijdslot(speler.get(dag_key, ''))
-                is_beschikbaar = any(
-                    self.tijden_overlappen((tijdslot_start, tijdslot_eind), (start, eind))
-                    for start, eind in speler_tijden
-                )
-                
-                if not is_beschikbaar:
-                    continue
-                
-                # Check locatie flexibiliteit - DIT IS NU STRIKT
-                if speler['LocatieVoorkeur'] == locatie:
-                    beschikbare_spelers.append(speler)
+            # Verzamel beschikbare spelers: locatie is strikt, dus alleen spelers met deze locatievoorkeur.
+            # Wie qua tijd en locatie past is voor elke week gelijk; per week valt alleen ingepland af.
+            slot_sleutel = (dag_key, locatie, tijdslot_str)
+            slot_spelers = self._spelers_per_slot.get(slot_sleutel)
+            if slot_spelers is None:
+                slot_spelers = [
+                    speler for speler in self._spelers_per_locatie.get(locatie, ())
+                    if speler['_tijd_maskers'].get(dag_key, 0) & slot_masker
+                ]
+                self._spelers_per_slot[slot_sleutel] = slot_spelers
+            beschikbare_spelers = [speler for speler in slot_spelers if speler['SpelerID'] not in ingeplande_ids]
             
             # Optimaliseer groepen
             if len(beschikbare_spelers) >= 4 and banen_lijst:
@@ -737,26 +961,8 @@ class HybridPlanningAlgorithm:
                         ingeplande_ids.add(speler['SpelerID'])
                     
                     # Bepaal karakteristieken
-                    mannen_count = sum(1 for s in groep if s['Geslacht'] in ['M', 'Man', 'Jongen'])
-                    vrouwen_count = 4 - mannen_count
-                    
-                    if mannen_count == 2 and vrouwen_count == 2:
-                        gender_balans = 'Perfect (2M/2V)'
-                    elif mannen_count == 4:
-                        gender_balans = 'Homogeen (4M)'
-                    elif vrouwen_count == 4:
-                        gender_balans = 'Homogeen (4V)'
-                    else:
-                        gender_balans = f'Anders (M:{mannen_count}, V:{vrouwen_count})'
-                    
-                    niveaus = [float(s['Niveau']) for s in groep if s['Niveau']]
-                    if niveaus:
-                        if len(set(niveaus)) == 1:
-                            niveau = str(int(niveaus[0]))
-                        else:
-                            niveau = f"{int(min(niveaus))}-{int(max(niveaus))} (gemengd)"
-                    else:
-                        niveau = "Onbekend"
+                    gender_balans = self._bepaal_gender_balans_string(groep)
+                    niveau = self._bepaal_niveau_string(groep)
                     
                     matches.append({
                         'week': week_nummer,
@@ -764,7 +970,7 @@ class HybridPlanningAlgorithm:
                         'location': locatie,
                         'time': tijdslot_str,
                         'baan': banen_lijst[i]['BaanNaam'],
-                        'group': ', '.join([f"{s['Voornaam']} {s['Achternaam']}" for s in groep]),
+                        'group': ', '.join([s['_volledige_naam'] for s in groep]),
                         'speler_ids': [s['SpelerID'] for s in groep],
                         'group_size': 4,
                         'niveau': niveau,
@@ -792,16 +998,9 @@ class HybridPlanningAlgorithm:
     def vind_niet_ingeplande_spelers(self, week_nummer):
         """Vind niet-ingeplande spelers"""
         ingeplande_ids = self.ingeplande_spelers_per_week.get(week_nummer, set())
-        niet_ingepland = []
-        
-        for speler in self.spelers:
-            if speler['SpelerID'] not in ingeplande_ids:
-                niet_ingepland.append({
-                    'SpelerID': speler['SpelerID'],
-                    'Naam': f"{speler['Voornaam']} {speler['Achternaam']}",
-                    'LocatieVoorkeur': speler['LocatieVoorkeur'],
-                    'Niveau': speler['Niveau']
-                })
+        # Rapportregels zijn per speler eenmalig opgebouwd en worden over de weken gedeeld (alleen lezen)
+        niet_ingepland = [speler['_rapport_regel'] for speler in self.spelers
+                          if speler['SpelerID'] not in ingeplande_ids]
         
         self.niet_ingeplande_spelers[week_nummer] = niet_ingepland
         return niet_ingepland
@@ -813,22 +1012,27 @@ class HybridPlanningAlgorithm:
         self.planning = []
         self.ingeplande_spelers_per_week = {}
         self.niet_ingeplande_spelers = {}
+        self._score_cache = {}
         # FASE 0: Plan legacy groepen eerst in (als beschikbaar)
         if self.legacy_groepen:
             self.plan_legacy_groepen(aantal_weken)
-        # Inclusief weekend dagen
-        dagen = ['Maandag', 'Dinsdag', 'Woensdag', 'Donderdag', 'Vrijdag', 'Zaterdag', 'Zondag']
         print("=== FASE 1: LOKALE OPTIMALISATIE ===")
         week1_ingepland = None
         week1_niet_ingepland = None
-        for week_nummer in range(1, aantal_weken + 1):
-            if week_nummer == 1:
-                print(f"Planning week {week_nummer}...")
+        weken = list(range(1, aantal_weken + 1))
+        for week_nummer in weken:
             if week_nummer not in self.ingeplande_spelers_per_week:
                 self.ingeplande_spelers_per_week[week_nummer] = set()
-            for dag in dagen:
-                matches = self.vind_matches(dag, week_nummer)
-                self.planning.extend(matches)
+        if weken:
+            print(f"Planning week {weken[0]}...")
+        # Weken zijn onafhankelijk van elkaar en kunnen desgewenst parallel worden gepland
+        if self.planning_parameters.get('parallelle_weekplanning', False) and len(weken) > 1:
+            week_resultaten = self._plan_weken_parallel(weken)
+        else:
+            week_resultaten = ((week_nummer, *self._plan_week(week_nummer)) for week_nummer in weken)
+        for week_nummer, matches, ingeplande_ids in week_resultaten:
+            self.planning.extend(matches)
+            self.ingeplande_spelers_per_week[week_nummer] = ingeplande_ids
             niet_ingepland = self.vind_niet_ingeplande_spelers(week_nummer)
             ingepland_count = len(self.ingeplande_spelers_per_week.get(week_nummer, set()))
             if week_nummer == 1:
@@ -846,10 +1050,38 @@ class HybridPlanningAlgorithm:
         self.plan_trainers_in()
         return self.planning
 
+    def _plan_week(self, week_nummer: int) -> Tuple[List[Dict], set]:
+        """Plan alle dagen van één week; geeft de matches en de ingeplande speler IDs van die week terug"""
+        # Inclusief weekend dagen
+        dagen = ['Maandag', 'Dinsdag', 'Woensdag', 'Donderdag', 'Vrijdag', 'Zaterdag', 'Zondag']
+        matches = []
+        for dag in dagen:
+            matches.extend(self.vind_matches(dag, week_nummer))
+        return matches, self.ingeplande_spelers_per_week[week_nummer]
+
+    def _plan_weken_parallel(self, weken: List[int]):
+        """Plan weken in aparte processen; resultaten komen terug in weekvolgorde"""
+        max_workers = min(len(weken), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_week_worker, initargs=(self,)) as executor:
+            for week_nummer, (matches, ingeplande_ids) in zip(weken, executor.map(_plan_week_in_worker, weken)):
+                yield week_nummer, matches, ingeplande_ids
+
     def voer_globale_optimalisatie_uit(self):
         """Globale optimalisatie"""
         print("Start globale optimalisatie...")
         
+        # Baan-index is alleen geldig zolang de optimalisatie de planning beheert
+        self._bouw_planning_index()
+        try:
+            self._voer_optimalisatie_iteraties_uit()
+        finally:
+            self._planning_index = None
+            self._planning_per_week = None
+        
+        print("Globale optimalisatie voltooid")
+
+    def _voer_optimalisatie_iteraties_uit(self):
+        """Voer de verbeter-iteraties van de globale optimalisatie uit"""
         for iteratie in range(self.max_verbeter_iteraties):
             print(f"  Iteratie {iteratie + 1}/{self.max_verbeter_iteraties}")
             
@@ -879,13 +1111,58 @@ class HybridPlanningAlgorithm:
             if verbeteringen == 0:
                 print("  Geen verdere verbeteringen mogelijk, stoppen met optimalisatie")
                 break
-        
-        print("Globale optimalisatie voltooid")
+
+    @staticmethod
+    def _planning_sleutel(match: Dict) -> Tuple:
+        """Sleutel die een baan in een bepaalde week uniek aanduidt"""
+        return (match['week'], match['day'], match['location'], match['time'], match['baan'])
+
+    def _bouw_planning_index(self):
+        """Bouw de index van baan-sleutel naar posities in self.planning"""
+        self._planning_index = defaultdict(list)
+        for i, match in enumerate(self.planning):
+            self._planning_index[self._planning_sleutel(match)].append(i)
+        self._planning_per_week = self._groepeer_planning_per_week()
+
+    def _groepeer_planning_per_week(self) -> Dict[int, List[Dict]]:
+        """Groepeer de planning per week; weken en matches in planningvolgorde"""
+        matches_per_week = defaultdict(list)
+        for match in self.planning:
+            matches_per_week[match['week']].append(match)
+        return matches_per_week
+
+    def _matches_per_week(self) -> Dict[int, List[Dict]]:
+        """Matches per week; tijdens globale optimalisatie uit de bijgehouden index.
+        
+        Verplaatsingen en swaps wijzigen matches alleen in place (de week blijft gelijk), hersamenstelling
+        bouwt de index opnieuw op, dus de gecachte groepering blijft geldig.
+        """
+        if self._planning_per_week is not None:
+            return self._planning_per_week
+        return self._groepeer_planning_per_week()
+
+    def _voeg_match_toe(self, match: Dict):
+        """Voeg een match toe aan de planning en houd een eventuele baan-index bij"""
+        self.planning.append(match)
+        if self._planning_index is not None:
+            self._planning_index[self._planning_sleutel(match)].append(len(self.planning) - 1)
+            self._planning_per_week[match['week']].append(match)
+
+    def _vind_planning_posities(self, sleutel: Tuple) -> List[int]:
+        """Posities (oplopend) van matches op deze baan; zonder index wordt de planning gescand"""
+        if self._planning_index is not None:
+            return self._planning_index.get(sleutel, [])
+        return [i for i, m in enumerate(self.planning) if self._planning_sleutel(m) == sleutel]
 
     def _voer_groep_verplaatsing_fase_uit(self) -> int:
         """Voer groep verplaatsing uit"""
         verbeteringen = 0
-        planning_gesorteerd = sorted(self.planning, key=lambda x: x.get('quality_score', 0.0))
+        drempel = self.optimalisatie_instellingen['excellente_groep_drempel']
+        # Alleen niet-legacy groepen onder de drempel komen in aanmerking; verplaatsen verhoogt scores
+        # alleen, dus wat vooraf afvalt zou in de lus ook worden overgeslagen
+        kandidaten = [m for m in self.planning
+                      if not m.get('legacy', False) and m.get('quality_score', 0.0) < drempel]
+        planning_gesorteerd = sorted(kandidaten, key=lambda x: x.get('quality_score', 0.0))
         
         for match in planning_gesorteerd:
             # Skip legacy groepen - deze blijven intact
@@ -893,7 +1170,7 @@ class HybridPlanningAlgorithm:
                 continue
                 
             # Gebruik configuratie waarde voor excellente groep drempel
-            if match.get('quality_score', 0.0) >= self.optimalisatie_instellingen['excellente_groep_drempel']:
+            if match.get('quality_score', 0.0) >= drempel:
                 continue
             
             beste_alternatief = self._vind_beste_alternatief_tijdslot(match)
@@ -907,37 +1184,58 @@ class HybridPlanningAlgorithm:
     def _voer_speler_swapping_uit(self) -> int:
         """Voer speler swapping uit"""
         verbeteringen = 0
-        matches_per_week = defaultdict(list)
-        
-        for match in self.planning:
-            matches_per_week[match['week']].append(match)
+        matches_per_week = self._matches_per_week()
         
         for week_matches in matches_per_week.values():
             if len(week_matches) < 2:
                 continue
-                
+            
+            niveau_banden = {id(m): self._bepaal_niveau_band(m) for m in week_matches}
             week_swaps = 0
             for i, match1 in enumerate(week_matches):
                 for match2 in week_matches[i+1:]:
                     # Gebruik configuratie waarde voor max swaps per week
                     if week_swaps >= self.optimalisatie_instellingen['max_swaps_per_week']:
                         break
+                    # Groepen met te ver uit elkaar liggende niveaus kunnen nooit een geldige swap opleveren
+                    if not self._niveau_banden_swap_compatibel(niveau_banden[id(match1)], niveau_banden[id(match2)]):
+                        continue
                     if self._probeer_speler_swap_tussen_groepen(match1, match2):
                         verbeteringen += 1
                         week_swaps += 1
+                        niveau_banden[id(match1)] = self._bepaal_niveau_band(match1)
+                        niveau_banden[id(match2)] = self._bepaal_niveau_band(match2)
                 # Gebruik configuratie waarde voor max swaps per week
                 if week_swaps >= self.optimalisatie_instellingen['max_swaps_per_week']:
                     break
         
         return verbeteringen
 
+    def _bepaal_niveau_band(self, match: Dict):
+        """Geef (laagste, hoogste) gecorrigeerd niveau van een groep, None als niet alle spelers een niveau hebben"""
+        niveaus = [s['_gecorrigeerd_niveau'] for s in self._haal_spelers_uit_match(match)]
+        if len(niveaus) != self.planning_parameters['spelers_per_groep'] or not all(n > 0 for n in niveaus):
+            return None
+        return min(niveaus), max(niveaus)
+
+    def _niveau_banden_swap_compatibel(self, band1, band2) -> bool:
+        """Check of een speler swap tussen twee groepen aan het harde niveau filter kan voldoen.
+        
+        Na een swap moet de nieuwe speler binnen max_niveau_verschil van de blijvers liggen, dus de
+        niveau banden van beide groepen moeten binnen die marge overlappen.
+        """
+        if band1 is None or band2 is None:
+            return True
+        # Bij een drempel <= 0 kunnen ook groepen die de harde filters niet halen geaccepteerd worden
+        if self.optimalisatie_instellingen['minimale_kwaliteitsdrempel'] <= 0:
+            return True
+        max_verschil = self.harde_filters['max_niveau_verschil']
+        return band2[0] <= band1[1] + max_verschil and band2[1] >= band1[0] - max_verschil
+
     def _voer_groep_hersamenstelling_uit(self) -> int:
         """Voer groep hersamenstelling uit"""
         improvements = 0
-        matches_per_week = defaultdict(list)
-        
-        for match in self.planning:
-            matches_per_week[match['week']].append(match)
+        matches_per_week = self._matches_per_week()
         
         for week_matches in matches_per_week.values():
             # Gebruik configuratie waarde voor slechte groep drempel
@@ -958,80 +1256,118 @@ class HybridPlanningAlgorithm:
         beste_alternatief = None
         beste_score = huidige_score
         
+        # De score hangt alleen van de locatie af en de spelerscheck alleen van het slot:
+        # beide eenmaal per aanroep bepalen in plaats van per baan
+        score_per_locatie = {}
+        spelers_beschikbaar_per_slot = {}
+        
+        # Forward checking: spelers zonder SamenMet voorkeuren zijn aan hun eigen locatie gebonden
+        vaste_locaties = {s['LocatieVoorkeur'] for s in spelers if not s['_locatie_flexibel']}
+        if len(vaste_locaties) > 1:
+            return None
+        
         # Gebruik alle dagen inclusief weekend voor optimalisatie
         for dag in ['Maandag', 'Dinsdag', 'Woensdag', 'Donderdag', 'Vrijdag']:
-            dag_key = dag.capitalize()
-            for baan in self.banen:
-                if (baan['Dag'].capitalize() == dag_key and 
-                    not (dag == huidige_match['day'] and 
-                         baan['Locatie'] == huidige_match['location'] and 
-                         baan['Tijdslot'] == huidige_match['time'])):
+            # Bovengrens: boven de maximale groepsscore kan geen enkel slot nog uitkomen
+            if beste_score >= self.maximale_groepsscore:
+                break
+            # Een speler die deze dag helemaal niet kan, maakt elk slot op deze dag onhaalbaar
+            if not all(s['_tijd_maskers'].get(dag, 0) for s in spelers):
+                continue
+            is_huidige_dag = dag == huidige_match['day']
+            for baan in self._banen_per_dag.get(dag, ()):
+                if not (is_huidige_dag and 
+                        baan['Locatie'] == huidige_match['location'] and 
+                        baan['Tijdslot'] == huidige_match['time']):
                     
-                    if (self._zijn_alle_spelers_beschikbaar(spelers, dag_key, baan['Tijdslot'], baan['Locatie']) and
-                        self._is_baan_beschikbaar(huidige_match['week'], dag, baan['Locatie'], baan['Tijdslot'], baan['BaanNaam'])):
-                        
-                        score = self._bereken_score_voor_tijdslot(spelers, dag, baan['Locatie'], baan['Tijdslot'])
-                        if score > beste_score:
-                            beste_score = score
-                            beste_alternatief = {
-                                'week': huidige_match['week'],
-                                'day': dag,
-                                'location': baan['Locatie'],
-                                'time': baan['Tijdslot'],
-                                'baan': baan['BaanNaam'],
-                                'score': score
-                            }
+                    locatie = baan['Locatie']
+                    if vaste_locaties and locatie not in vaste_locaties:
+                        continue
+                    score = score_per_locatie.get(locatie)
+                    if score is None:
+                        score = self._bereken_score_voor_tijdslot(spelers, dag, locatie, baan['Tijdslot'])
+                        score_per_locatie[locatie] = score
+                    if score <= beste_score:
+                        continue  # Kan het huidige beste alternatief niet verbeteren
+                    
+                    slot = (dag, locatie, baan['Tijdslot'])
+                    beschikbaar = spelers_beschikbaar_per_slot.get(slot)
+                    if beschikbaar is None:
+                        beschikbaar = self._zijn_alle_spelers_beschikbaar(spelers, dag, baan['Tijdslot'], locatie)
+                        spelers_beschikbaar_per_slot[slot] = beschikbaar
+                    
+                    if (beschikbaar and
+                        self._is_baan_beschikbaar(huidige_match['week'], dag, locatie, baan['Tijdslot'], baan['BaanNaam'])):
+                        beste_score = score
+                        beste_alternatief = {
+                            'week': huidige_match['week'],
+                            'day': dag,
+                            'location': baan['Locatie'],
+                            'time': baan['Tijdslot'],
+                            'baan': baan['BaanNaam'],
+                            'score': score
+                        }
         
         return beste_alternatief
 
     def _haal_spelers_uit_match(self, match: Dict) -> List[Dict]:
         """Haal spelers uit match"""
-        speler_ids = match['speler_ids']
-        return [s for s in self.spelers if s['SpelerID'] in speler_ids]
+        # Opzoeken via SpelerID index; teruggegeven in de volgorde van self.spelers
+        indices = sorted(index for speler_id in set(match['speler_ids'])
+                         for index in self._indices_per_speler_id.get(speler_id, ()))
+        return [self.spelers[index] for index in indices]
 
     def _zijn_alle_spelers_beschikbaar(self, spelers: List[Dict], dag_key: str, tijdslot_str: str, locatie: str) -> bool:
         """Check of alle spelers beschikbaar zijn"""
-        # Fix voor legacy tijdslots: converteer enkele tijdstip naar bereik
-        if '-' not in tijdslot_str and ':' in tijdslot_str:
-            # Single time zoals "18:00" -> maak er "18:00-19:00" van
-            try:
-                start_tijd = tijdslot_str.strip()
-                start_uur = int(start_tijd.split(':')[0])
-                eind_uur = start_uur + 1
-                tijdslot_str = f"{start_tijd}-{eind_uur:02d}:00"
-            except:
-                pass
-        
-        try:
-            tijdslot_start, tijdslot_eind = tijdslot_str.split('-')
-        except ValueError:
+        slot_masker = self._beschikbaarheid_masker(tijdslot_str)
+        if slot_masker is None:
             return False
         
         for speler in spelers:
-            # Check tijd
-            speler_tijden = self.parse_tijdslot(speler.get(dag_key, ''))
-            tijd_overlap = any(self.tijden_overlappen((tijdslot_start, tijdslot_eind), (start, eind)) 
-                              for start, eind in speler_tijden)
-            if not tijd_overlap:
-                return False
-            
             # Check locatie - meer flexibel voor legacy groepen
-            heeft_locatie = speler['LocatieVoorkeur'] == locatie
-            heeft_voorkeuren = speler['SpelerID'] in self.samen_met_voorkeuren
-            
             # Voor legacy groepen: accepteer ook spelers die geen stricte locatie voorkeur hebben
-            if not (heeft_locatie or heeft_voorkeuren):
+            if not (speler['_locatie_flexibel'] or speler['LocatieVoorkeur'] == locatie):
+                return False
+            
+            # Check tijd (overlap van de voorberekende minuut-bitmaskers)
+            if not speler['_tijd_maskers'].get(dag_key, 0) & slot_masker:
                 return False
         
         return True
 
+    def _beschikbare_spelers_voor_slot(self, dag_key: str, tijdslot_str: str, locatie: str) -> List[Dict]:
+        """Spelers (in laadvolgorde) die qua tijd en locatie in een slot passen; gecachet omdat dit per week gelijk is"""
+        sleutel = (dag_key, locatie, tijdslot_str)
+        spelers = self._beschikbare_spelers_per_slot.get(sleutel)
+        if spelers is None:
+            spelers = [p for p in self.spelers if self._zijn_alle_spelers_beschikbaar([p], dag_key, tijdslot_str, locatie)]
+            self._beschikbare_spelers_per_slot[sleutel] = spelers
+        return spelers
+
+    def _beschikbaarheid_masker(self, tijdslot_str: str):
+        """Geef het (gecachte) bitmasker voor een beschikbaarheidscheck, None als het tijdslot onbruikbaar is"""
+        if tijdslot_str in self._beschikbaarheid_maskers:
+            return self._beschikbaarheid_maskers[tijdslot_str]
+        
+        genormaliseerd = tijdslot_str
+        # Fix voor legacy tijdslots: converteer enkele tijdstip naar bereik
+        if '-' not in genormaliseerd and ':' in genormaliseerd:
+            # Single time zoals "18:00" -> maak er "18:00-19:00" van
+            try:
+                start_tijd = genormaliseerd.strip()
+                start_uur = int(start_tijd.split(':')[0])
+                eind_uur = start_uur + 1
+                genormaliseerd = f"{start_tijd}-{eind_uur:02d}:00"
+            except ValueError:
+                pass
+        
+        masker = self._tijdslot_masker(genormaliseerd) if genormaliseerd.count('-') == 1 else None
+        self._beschikbaarheid_maskers[tijdslot_str] = masker
+        return masker
+
     def _is_baan_beschikbaar(self, week: int, dag: str, locatie: str, tijdslot: str, baan_naam: str) -> bool:
         """Check of baan beschikbaar is"""
-        return not any(
-            m['week'] == week and m['day'] == dag and m['location'] == locatie and 
-            m['time'] == tijdslot and m['baan'] == baan_naam
-            for m in self.planning
-        )
+        return not self._vind_planning_posities((week, dag, locatie, tijdslot, baan_naam))
 
     def _bereken_score_voor_tijdslot(self, spelers: List[Dict], dag: str, locatie: str, tijdslot: str) -> float:
         """Bereken score voor tijdslot"""
@@ -1041,20 +1377,23 @@ class HybridPlanningAlgorithm:
 
     def _voer_groep_verplaatsing_uit(self, oude_match: Dict, nieuwe_match: Dict) -> bool:
         """Voer groep verplaatsing uit"""
-        for i, match in enumerate(self.planning):
-            if (match['week'] == oude_match['week'] and match['day'] == oude_match['day'] and
-                match['location'] == oude_match['location'] and match['time'] == oude_match['time'] and
-                match['baan'] == oude_match['baan']):
-                
-                self.planning[i].update({
-                    'day': nieuwe_match['day'],
-                    'location': nieuwe_match['location'],
-                    'time': nieuwe_match['time'],
-                    'baan': nieuwe_match['baan'],
-                    'quality_score': nieuwe_match['score']
-                })
-                return True
-        return False
+        oude_sleutel = self._planning_sleutel(oude_match)
+        posities = self._vind_planning_posities(oude_sleutel)
+        if not posities:
+            return False
+        
+        i = posities[0]
+        self.planning[i].update({
+            'day': nieuwe_match['day'],
+            'location': nieuwe_match['location'],
+            'time': nieuwe_match['time'],
+            'baan': nieuwe_match['baan'],
+            'quality_score': nieuwe_match['score']
+        })
+        if self._planning_index is not None:
+            posities.remove(i)
+            insort(self._planning_index[self._planning_sleutel(self.planning[i])], i)
+        return True
 
     def _probeer_speler_swap_tussen_groepen(self, match1: Dict, match2: Dict) -> bool:
         """Probeert de beste speler-swap te vinden tussen twee groepen en voert deze uit"""
@@ -1069,72 +1408,71 @@ class HybridPlanningAlgorithm:
         huidige_totaal = match1.get('quality_score', 0.0) + match2.get('quality_score', 0.0)
         beste_verbetering = 0.0
         beste_swap = None
+        drempel = self.optimalisatie_instellingen['minimale_kwaliteitsdrempel']
         
+        # Een swap is toegestaan als beide spelers in het slot van de andere groep kunnen:
+        # dat is per speler te bepalen, dus eenmalig i.p.v. per paar
+        naar_match2 = self._beschikbaarheid_voor_match(spelers1, match2)
+        naar_match1 = self._beschikbaarheid_voor_match(spelers2, match1)
+        
+        # Swaps worden in-place geprobeerd en teruggedraaid; alleen de beste swap wordt als nieuwe lijsten gebouwd
         for i, speler1 in enumerate(spelers1):
+            if not naar_match2[i]:
+                continue
             for j, speler2 in enumerate(spelers2):
-                if self._is_speler_swap_toegestaan(speler1, speler2, match1, match2):
-                    nieuwe_groep1 = spelers1.copy()
-                    nieuwe_groep2 = spelers2.copy()
-                    nieuwe_groep1[i] = speler2
-                    nieuwe_groep2[j] = speler1
-                    
-                    nieuwe_score1 = self.calculate_group_quality_score(nieuwe_groep1)
-                    nieuwe_score2 = self.calculate_group_quality_score(nieuwe_groep2)
-                    nieuwe_totaal = nieuwe_score1 + nieuwe_score2
-                    
-                    verbetering = nieuwe_totaal - huidige_totaal
-                    if (verbetering > beste_verbetering and 
-                        verbetering >= self.min_score_verbetering and
-                        nieuwe_score1 >= self.optimalisatie_instellingen['minimale_kwaliteitsdrempel'] and
-                        nieuwe_score2 >= self.optimalisatie_instellingen['minimale_kwaliteitsdrempel']):
-                        beste_verbetering = verbetering
-                        beste_swap = {
-                            'i': i, 'j': j,
-                            'groep1': nieuwe_groep1, 'groep2': nieuwe_groep2,
-                            'score1': nieuwe_score1, 'score2': nieuwe_score2
-                        }
+                if not naar_match1[j]:
+                    continue
+                spelers1[i] = speler2
+                nieuwe_score1 = self.calculate_group_quality_score(spelers1)
+                spelers1[i] = speler1
+                # Groep 2 kan hooguit de maximale score halen: sla groep 2 over als de swap
+                # dan nog steeds geen (betere) kandidaat kan worden
+                if (nieuwe_score1 < drempel or
+                        nieuwe_score1 + self.maximale_groepsscore - huidige_totaal <= beste_verbetering):
+                    continue
+                
+                spelers2[j] = speler1
+                nieuwe_score2 = self.calculate_group_quality_score(spelers2)
+                spelers2[j] = speler2
+                nieuwe_totaal = nieuwe_score1 + nieuwe_score2
+                
+                verbetering = nieuwe_totaal - huidige_totaal
+                if (verbetering > beste_verbetering and 
+                    verbetering >= self.min_score_verbetering and
+                    nieuwe_score2 >= drempel):
+                    beste_verbetering = verbetering
+                    beste_swap = {
+                        'i': i, 'j': j,
+                        'score1': nieuwe_score1, 'score2': nieuwe_score2
+                    }
         
         if beste_swap:
+            i, j = beste_swap['i'], beste_swap['j']
+            beste_swap['groep1'] = spelers1[:i] + [spelers2[j]] + spelers1[i + 1:]
+            beste_swap['groep2'] = spelers2[:j] + [spelers1[i]] + spelers2[j + 1:]
             return self._voer_speler_swap_uit(match1, match2, beste_swap)
         return False
 
-    def _is_speler_swap_toegestaan(self, speler1: Dict, speler2: Dict, match1: Dict, match2: Dict) -> bool:
-        """Check of speler swap toegestaan is"""
-        return (self._zijn_alle_spelers_beschikbaar([speler1], match2['day'].capitalize(), match2['time'], match2['location']) and
-                self._zijn_alle_spelers_beschikbaar([speler2], match1['day'].capitalize(), match1['time'], match1['location']))
+    def _beschikbaarheid_voor_match(self, spelers: List[Dict], match: Dict) -> List[bool]:
+        """Geef per speler aan of die beschikbaar is voor het slot van een (andere) match"""
+        dag_key = match['day'].capitalize()
+        tijdslot = match['time']
+        locatie = match['location']
+        return [self._zijn_alle_spelers_beschikbaar([speler], dag_key, tijdslot, locatie) for speler in spelers]
 
     def _voer_speler_swap_uit(self, match1: Dict, match2: Dict, swap_info: Dict) -> bool:
         """Voer speler swap uit"""
-        try:
-            for i, match in enumerate(self.planning):
-                if (match['week'] == match1['week'] and match['day'] == match1['day'] and
-                    match['location'] == match1['location'] and match['time'] == match1['time'] and
-                    match['baan'] == match1['baan']):
-                    
-                    groep = swap_info['groep1']
-                    self.planning[i].update({
-                        'group': ', '.join([f"{s['Voornaam']} {s['Achternaam']}" for s in groep]),
-                        'speler_ids': [s['SpelerID'] for s in groep],
-                        'quality_score': swap_info['score1']
-                    })
-                    break
-            
-            for i, match in enumerate(self.planning):
-                if (match['week'] == match2['week'] and match['day'] == match2['day'] and
-                    match['location'] == match2['location'] and match['time'] == match2['time'] and
-                    match['baan'] == match2['baan']):
-                    
-                    groep = swap_info['groep2']
-                    self.planning[i].update({
-                        'group': ', '.join([f"{s['Voornaam']} {s['Achternaam']}" for s in groep]),
-                        'speler_ids': [s['SpelerID'] for s in groep],
-                        'quality_score': swap_info['score2']
-                    })
-                    break
-            
-            return True
-        except:
-            return False
+        for match, groep, score in ((match1, swap_info['groep1'], swap_info['score1']),
+                                    (match2, swap_info['groep2'], swap_info['score2'])):
+            posities = self._vind_planning_posities(self._planning_sleutel(match))
+            if posities:
+                self.planning[posities[0]].update({
+                    'group': ', '.join([s['_volledige_naam'] for s in groep]),
+                    'speler_ids': [s['SpelerID'] for s in groep],
+                    'quality_score': score
+                })
+        
+        return True
 
     def _try_group_reassembly_for_week(self, poor_matches: List[Dict]) -> bool:
         """Probeer groep hersamenstelling"""
@@ -1156,20 +1494,24 @@ class HybridPlanningAlgorithm:
         if len(all_players) >= 4:
             new_groups = self.optimize_groups_in_slot(all_players, len(available_slots))
             
-            # Filter groepen met score > 0
+            # Filter groepen met score > 0 (score eenmalig per groep bepalen)
             valid_groups = []
+            valid_scores = []
             for group in new_groups:
                 score = self.calculate_group_quality_score(group)
                 if score > 0.0:  # Alleen groepen die voldoen aan harde filters
                     valid_groups.append(group)
+                    valid_scores.append(score)
             
             if valid_groups:
                 old_score = sum(m.get('quality_score', 0.0) for m in poor_matches)
-                new_score = sum(self.calculate_group_quality_score(g) for g in valid_groups)
+                new_score = sum(valid_scores)
                 
                 if new_score > old_score + self.min_score_verbetering:
                     # Verwijder oude matches en voeg nieuwe toe
-                    self.planning = [m for m in self.planning if m not in poor_matches]
+                    # Op identiteit filteren: dict-vergelijking per planningregel is duur
+                    poor_ids = {id(m) for m in poor_matches}
+                    self.planning = [m for m in self.planning if id(m) not in poor_ids]
                     
                     for i, group in enumerate(valid_groups[:len(available_slots)]):
                         slot = available_slots[i]
@@ -1179,15 +1521,17 @@ class HybridPlanningAlgorithm:
                             'location': slot['location'],
                             'time': slot['time'],
                             'baan': slot['baan'],
-                            'group': ', '.join([f"{s['Voornaam']} {s['Achternaam']}" for s in group]),
+                            'group': ', '.join([s['_volledige_naam'] for s in group]),
                             'speler_ids': [s['SpelerID'] for s in group],
                             'group_size': 4,
                             'niveau': self._bepaal_niveau_string(group),
                             'gender_balans': self._bepaal_gender_balans_string(group),
-                            'quality_score': self.calculate_group_quality_score(group),
+                            'quality_score': valid_scores[i],
                             'flexible_players': 0
                         })
                     
+                    if self._planning_index is not None:
+                        self._bouw_planning_index()
                     return True
         
         return False
@@ -1217,26 +1561,26 @@ class HybridPlanningAlgorithm:
             writer = csv.writer(f)
             writer.writerow(['week', 'day', 'location', 'time', 'baan', 'trainer', 'group_size', 'group', 'speler_ids', 'niveau', 'gender_balans', 'quality_score', 'legacy', 'legacy_type'])
             
-            for match in sorted_planning:
-                writer.writerow([
-                    match['week'], match['day'], match['location'], match['time'], match['baan'],
-                    match.get('trainer', 'ONBEKEND'),
-                    match['group_size'], match['group'], ",".join(map(str, match['speler_ids'])),
-                    match.get('niveau', ''), match.get('gender_balans', ''),
-                    f"{match.get('quality_score', 0.0):.2f}",
-                    match.get('legacy', False), match.get('legacy_type', '')
-                ])
+            writer.writerows(
+                (match['week'], match['day'], match['location'], match['time'], match['baan'],
+                 match.get('trainer', 'ONBEKEND'),
+                 match['group_size'], match['group'], ",".join(map(str, match['speler_ids'])),
+                 match.get('niveau', ''), match.get('gender_balans', ''),
+                 format(match.get('quality_score', 0.0), '.2f'),
+                 match.get('legacy', False), match.get('legacy_type', ''))
+                for match in sorted_planning
+            )
         
         with open(rapport_bestand, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             writer.writerow(['week', 'speler_id', 'naam', 'locatie_voorkeur', 'niveau'])
             
-            for week_nummer, spelers in self.niet_ingeplande_spelers.items():
-                for speler in spelers:
-                    writer.writerow([
-                        week_nummer, speler['SpelerID'], speler['Naam'],
-                        speler['LocatieVoorkeur'], speler['Niveau']
-                    ])
+            writer.writerows(
+                (week_nummer, speler['SpelerID'], speler['Naam'],
+                 speler['LocatieVoorkeur'], speler['Niveau'])
+                for week_nummer, spelers in self.niet_ingeplande_spelers.items()
+                for speler in spelers
+            )
         
         print(f"Planning geëxporteerd naar: {planning_bestand}")
         print(f"Rapport geëxporteerd naar: {rapport_bestand}")
@@ -1249,30 +1593,58 @@ class HybridPlanningAlgorithm:
         print("\n============================================================")
         print("TENNIS PLANNING SAMENVATTING")
         print("============================================================\n")
+        # Verzamel alle statistieken in één pass over de planning
+        matches_per_week = defaultdict(list)
+        alle_scores = []
+        gender_counts = {}
+        niveau_counts = {}
+        trainers = []
+        volledig_legacy = 0
+        gedeeltelijk_legacy = 0
+        legacy_groep_weken = {}  # Unieke volledige legacy groepen (volgorde-onafhankelijk) -> weken
+        for m in self.planning:
+            matches_per_week[m['week']].append(m)
+            alle_scores.append(m.get('quality_score', 0.0))
+            gb = m.get('gender_balans', 'Onbekend')
+            gender_counts[gb] = gender_counts.get(gb, 0) + 1
+            niv = m.get('niveau', 'Onbekend')
+            niveau_counts[niv] = niveau_counts.get(niv, 0) + 1
+            trainers.append(m.get('trainer', 'ONBEKEND'))
+            if m.get('legacy', False):
+                gedeeltelijk_legacy += 1
+                if m.get('legacy_type') == 'legacy_volledig':
+                    volledig_legacy += 1
+                    if 'speler_ids' in m:
+                        legacy_groep_weken.setdefault(tuple(sorted(m['speler_ids'])), []).append(m['week'])
         # Algemene statistieken
-        weken = sorted(set(match['week'] for match in self.planning))
+        weken = sorted(matches_per_week)
         week1 = weken[0]
-        trainingen_per_week = len([m for m in self.planning if m['week'] == week1])
+        week1_matches = matches_per_week[week1]
+        trainingen_per_week = len(week1_matches)
         totaal_trainingen = len(self.planning)
         print("ALGEMENE STATISTIEKEN")
         print(f"  Aantal weken: {len(weken)}")
         print(f"  Trainingen per week: {trainingen_per_week}")
         print(f"  Totaal trainingen: {totaal_trainingen}\n")
         # Week 1 representatief overzicht
-        week1_matches = [m for m in self.planning if m['week'] == week1]
         ingepland = len(self.ingeplande_spelers_per_week.get(week1, set()))
         niet_ingepland = self.niet_ingeplande_spelers.get(week1, [])
         print(f"WEEK {week1} (representatief voor alle weken)")
         print(f"  Ingeplande spelers: {ingepland}")
         print(f"  Niet ingeplande spelers: {len(niet_ingepland)}\n")
         # Kwaliteitsanalyse
-        alle_scores = [m.get('quality_score', 0.0) for m in self.planning]
         gemiddelde_score = sum(alle_scores) / len(alle_scores) if alle_scores else 0.0
         hoogste_score = max(alle_scores) if alle_scores else 0.0
-        excellent = sum(1 for s in alle_scores if s > 9)
-        good = sum(1 for s in alle_scores if 7 <= s <= 9)
-        average = sum(1 for s in alle_scores if 5 <= s < 7)
-        poor = sum(1 for s in alle_scores if s < 5)
+        excellent = good = average = poor = 0
+        for score in alle_scores:
+            if score > 9:
+                excellent += 1
+            elif score >= 7:
+                good += 1
+            elif score >= 5:
+                average += 1
+            else:
+                poor += 1
         print("KWALITEITSANALYSE")
         print(f"  Gemiddelde score: {gemiddelde_score:.2f}")
         print(f"  Hoogste score: {hoogste_score:.2f}")
@@ -1281,55 +1653,31 @@ class HybridPlanningAlgorithm:
         print(f"  Average (5.0-7.0): {average} ({average/totaal_trainingen*100:.1f}%)")
         print(f"  Poor (<5.0): {poor} ({poor/totaal_trainingen*100:.1f}%)\n")
         # Groepstypen
-        volledig_legacy = sum(1 for m in self.planning if m.get('legacy', False) and m.get('legacy_type') == 'legacy_volledig')
-        gedeeltelijk_legacy = sum(1 for m in self.planning if m.get('legacy', False))
-        nieuw = sum(1 for m in self.planning if not m.get('legacy', False))
+        nieuw = totaal_trainingen - gedeeltelijk_legacy
         print("GROEPSTYPEN (totaal aantal trainingen over alle weken)")
         print(f"  Volledige legacy trainingen: {volledig_legacy}")
         print(f"  Gedeeltelijke legacy trainingen: {gedeeltelijk_legacy}")
         print(f"  Nieuwe trainingen: {nieuw}\n")
-        # Unieke volledige legacy groepen (op basis van samenstelling, volgorde-onafhankelijk)
-        unieke_legacy_ids = set()
-        for m in self.planning:
-            if m.get('legacy', False) and m.get('legacy_type') == 'legacy_volledig' and 'speler_ids' in m:
-                unieke_legacy_ids.add(tuple(sorted(m['speler_ids'])))
-        print(f"UNIEKE VOLLEDIGE LEGACY GROEPEN: {len(unieke_legacy_ids)}")
+        print(f"UNIEKE VOLLEDIGE LEGACY GROEPEN: {len(legacy_groep_weken)}")
         # Overzicht van alle unieke volledige legacy-groepen en hun weken
-        legacy_groep_weken = {}
-        for m in self.planning:
-            if m.get('legacy', False) and m.get('legacy_type') == 'legacy_volledig' and 'speler_ids' in m:
-                key = tuple(sorted(m['speler_ids']))
-                week = m['week']
-                if key not in legacy_groep_weken:
-                    legacy_groep_weken[key] = []
-                legacy_groep_weken[key].append(week)
         print("\nOVERZICHT UNIEKE VOLLEDIGE LEGACY GROEPEN:")
-        for groep, weken in sorted(legacy_groep_weken.items(), key=lambda x: x[0]):
-            print(f"  SpelerIDs: {groep} | Weken: {sorted(weken)}")
+        for groep, groep_weken in sorted(legacy_groep_weken.items(), key=lambda x: x[0]):
+            print(f"  SpelerIDs: {groep} | Weken: {sorted(groep_weken)}")
         # Genderverdeling
-        gender_counts = {}
-        for m in self.planning:
-            gb = m.get('gender_balans', 'Onbekend')
-            gender_counts[gb] = gender_counts.get(gb, 0) + 1
         print("GENDER VERDELING (totaal)")
         for k, v in sorted(gender_counts.items(), key=lambda x: -x[1]):
             print(f"  {k}: {v} ({v/totaal_trainingen*100:.1f}%)")
         print()
         # Niveauverdeling (top 5)
-        niveau_counts = {}
-        for m in self.planning:
-            niv = m.get('niveau', 'Onbekend')
-            niveau_counts[niv] = niveau_counts.get(niv, 0) + 1
-        top_niveaus = sorted(niveau_counts.items(), key=lambda x: -x[1])[:5]
+        top_niveaus = heapq.nlargest(5, niveau_counts.items(), key=lambda x: x[1])
         print("NIVEAU VERDELING (top 5)")
         for niv, count in top_niveaus:
             print(f"  {niv}: {count} ({count/totaal_trainingen*100:.1f}%)")
         print()
         # Trainerverdeling totaal
-        trainers = [m.get('trainer', 'ONBEKEND') for m in self.planning]
         unieke_trainers = set(trainers)
-        dummy_trainers = [t for t in unieke_trainers if t.startswith('Trainer')]
-        echte_trainers = [t for t in unieke_trainers if t not in dummy_trainers and t != 'ONBEKEND']
+        dummy_trainers = {t for t in unieke_trainers if t.startswith('Trainer')}
+        echte_trainers = {t for t in unieke_trainers if t not in dummy_trainers and t != 'ONBEKEND'}
         trainingen_echt = sum(1 for t in trainers if t in echte_trainers)
         trainingen_dummy = sum(1 for t in trainers if t in dummy_trainers)
         print("TRAINER TOEWIJZING (totaal over alle weken)")
@@ -1348,7 +1696,6 @@ class HybridPlanningAlgorithm:
         print(f"  Unieke echte trainers in week {week1}: {len(set(week1_echte))}")
         print(f"  Unieke dummy trainers in week {week1}: {len(set(week1_dummy))}")
         print(f"  Overzicht trainingen per trainer (week {week1}):")
-        from collections import Counter
         for t, count in Counter(week1_trainers).most_common():
             print(f"    {t}: {count} trainingen")
         print()
@@ -1378,18 +1725,8 @@ class HybridPlanningAlgorithm:
 
     def _vind_speler_by_naam(self, naam: str) -> Dict:
         """Vind speler object op basis van naam met flexibele matching"""
-        naam_clean = self.normalize_name(naam)
-        # Exacte match eerst proberen
-        for speler in self.spelers:
-            speler_naam = self.normalize_name(f"{speler['Voornaam']} {speler['Achternaam']}")
-            if speler_naam == naam_clean:
-                return speler
-        # Flexibele match voor kleine verschillen
-        for speler in self.spelers:
-            speler_naam = self.normalize_name(f"{speler['Voornaam']} {speler['Achternaam']}")
-            if speler_naam.replace(" ", "") == naam_clean.replace(" ", ""):
-                return speler
-        return None
+        # normalize_name verwijdert accenten, hoofdletters en spaties, dus één opzoeking volstaat
+        return self._speler_per_norm_naam.get(self.normalize_name(naam))
     
     def _vind_best_passende_speler(self, beschikbare_spelers: List[Dict], bestaande_groep: List[Dict]) -> Dict:
         """Vind de best passende speler om toe te voegen aan een groep"""
@@ -1397,10 +1734,10 @@ class HybridPlanningAlgorithm:
             return None
         
         # Bereken gemiddeld niveau en gender verdeling van bestaande groep
-        niveaus = [float(s['Niveau']) for s in bestaande_groep if s['Niveau']]
+        niveaus = [s['_niveau'] for s in bestaande_groep if s['_niveau'] is not None]
         gemiddeld_niveau = sum(niveaus) / len(niveaus) if niveaus else 6.0
         
-        mannen_count = sum(1 for s in bestaande_groep if s['Geslacht'] in ['M', 'Man', 'Jongen'])
+        mannen_count = sum(1 for s in bestaande_groep if s['_is_man'])
         vrouwen_count = len(bestaande_groep) - mannen_count
         
         beste_kandidaat = None
@@ -1408,15 +1745,15 @@ class HybridPlanningAlgorithm:
         
         for kandidaat in beschikbare_spelers:
             # Score op basis van niveau match
-            try:
-                kandidaat_niveau = float(kandidaat['Niveau'])
+            kandidaat_niveau = kandidaat['_niveau']
+            if kandidaat_niveau is not None:
                 niveau_verschil = abs(kandidaat_niveau - gemiddeld_niveau)
                 niveau_score = max(0, 3 - niveau_verschil)  # Hoe kleiner verschil, hoe hoger score
-            except:
+            else:
                 niveau_score = 0
             
             # Gender balans score
-            is_man = kandidaat['Geslacht'] in ['M', 'Man', 'Jongen']
+            is_man = kandidaat['_is_man']
             gender_score = 0
             
             nieuwe_groep_size = len(bestaande_groep) + 1
@@ -1434,119 +1771,34 @@ class HybridPlanningAlgorithm:
         
         return beste_kandidaat
     
-    def _verwerk_legacy_groep(self, legacy_groep: Dict, week_nummer: int) -> bool:
-        """Verwerk een legacy groep en plan deze in"""
-        groep_id = legacy_groep.get('GroepID', 'Onbekend')
-        speler_namen = [naam.strip() for naam in legacy_groep['Spelers'].split(',')]
+    def _legacy_blijvers(self, legacy_groep: Dict) -> List[Dict]:
+        """Spelers uit een legacy groep die gevonden worden en in de groep willen blijven (in groepsvolgorde)"""
         groep_spelers = []
-        # Zoek alle spelers die in de legacy groep zitten EN willen blijven
-        gevonden_spelers = []
-        niet_gevonden_spelers = []
-        willen_niet_blijven = []
-        for naam in speler_namen:
-            speler = self._vind_speler_by_naam(naam)
-            if speler:
-                gevonden_spelers.append(naam)
-                if speler.get('BlijftInHuidigeGroep', '').lower() == 'ja':
-                    groep_spelers.append(speler)
-                else:
-                    willen_niet_blijven.append(naam)
-            else:
-                niet_gevonden_spelers.append(naam)
-        aantal_blijvers = len(groep_spelers)
-        # Minimumgrootte van 2 afdwingen voor legacy groepen
-        if len(groep_spelers) < 2:
-            return False
-        dag = legacy_groep['Dag']
-        tijdslot = legacy_groep['Tijdslot']
-        originele_locatie = legacy_groep['Locatie']
-        current_size = len(groep_spelers)
-        target_size = 4
-        if current_size < 4:
-            if week_nummer not in self.ingeplande_spelers_per_week:
-                self.ingeplande_spelers_per_week[week_nummer] = set()
-            ingeplande_ids = self.ingeplande_spelers_per_week[week_nummer]
-            unplaced_players = [s for s in self.spelers if s['SpelerID'] not in ingeplande_ids and s['SpelerID'] not in [sp['SpelerID'] for sp in groep_spelers]]
-            slot_candidates = [p for p in unplaced_players if self._zijn_alle_spelers_beschikbaar([p], dag, tijdslot, originele_locatie)]
-            while len(groep_spelers) < target_size and slot_candidates:
-                beste_kandidaat = self._vind_best_passende_speler(slot_candidates, groep_spelers)
-                if beste_kandidaat:
-                    groep_spelers.append(beste_kandidaat)
-                    slot_candidates.remove(beste_kandidaat)
-                    unplaced_players.remove(beste_kandidaat)
-                else:
-                    break
-        if len(groep_spelers) > target_size:
-            groep_spelers = groep_spelers[:target_size]
-        spelers_beschikbaar = self._zijn_alle_spelers_beschikbaar(groep_spelers, dag, tijdslot, originele_locatie)
-        if not spelers_beschikbaar:
-            return False
-        harde_filters_ok = True
-        if aantal_blijvers < 2:
-            harde_filters_ok = self._voldoet_aan_harde_filters(groep_spelers, originele_locatie)
-        if not harde_filters_ok:
-            return False
-        baan_naam = self._vind_beschikbare_baan(week_nummer, dag, originele_locatie, tijdslot)
-        if not baan_naam:
-            return False
-        if len(groep_spelers) != 4:
-            return False
-        for speler in groep_spelers:
-            self.ingeplande_spelers_per_week[week_nummer].add(speler['SpelerID'])
-        groep_namen = ', '.join([f"{s['Voornaam']} {s['Achternaam']}" for s in groep_spelers])
-        gender_balans = self._bepaal_gender_balans_string(groep_spelers)
-        niveau = self._bepaal_niveau_string(groep_spelers)
-        legacy_info = self._bepaal_legacy_status(groep_spelers)
-        is_volledig_legacy = legacy_info['aantal_blijvend'] == legacy_info['totaal_origineel']
-        if is_volledig_legacy:
-            legacy_score = self.legacy_scoring['volledige_legacy_score']
-            groep_type = "legacy_volledig"
-            legacy_flag = True
-        else:
-            legacy_score = self._bereken_legacy_score(legacy_info)
-            groep_type = ""
-            legacy_flag = False
-        match = {
-            'week': week_nummer,
-            'day': dag,
-            'location': originele_locatie,
-            'time': tijdslot,
-            'baan': baan_naam,
-            'group': groep_namen,
-            'speler_ids': [s['SpelerID'] for s in groep_spelers],
-            'group_size': len(groep_spelers),
-            'niveau': niveau,
-            'gender_balans': gender_balans,
-            'quality_score': legacy_score,
-            'flexible_players': 0,
-            'legacy': legacy_flag,
-            'legacy_type': groep_type
-        }
-        self.planning.append(match)
-        return True
+        for naam in legacy_groep['Spelers'].split(','):
+            speler = self._vind_speler_by_naam(naam.strip())
+            if speler and speler['_blijft_in_groep']:
+                groep_spelers.append(speler)
+        return groep_spelers
 
     def _vind_beschikbare_baan(self, week_nummer: int, dag: str, locatie: str, tijdslot: str) -> str:
         """Vind een beschikbare baan voor het opgegeven tijdslot"""
-        for baan in self.banen:
-            if (baan['Dag'] == dag and baan['Locatie'] == locatie and 
-                baan['Tijdslot'] == tijdslot and 
-                self._is_baan_beschikbaar(week_nummer, dag, locatie, tijdslot, baan['BaanNaam'])):
+        for baan in self._banen_per_slot.get((dag, locatie, tijdslot), ()):
+            if self._is_baan_beschikbaar(week_nummer, dag, locatie, tijdslot, baan['BaanNaam']):
                 return baan['BaanNaam']
         return None
     
     def _vind_alternatief_legacy_slot(self, groep_spelers: List[Dict], voorkeur_dag: str, voorkeur_locatie: str) -> Dict:
         """Vind alternatief tijdslot voor legacy groep"""
         # Probeer eerst zelfde dag, andere tijden
-        dag_banen = [b for b in self.banen if b['Dag'] == voorkeur_dag and b['Locatie'] == voorkeur_locatie]
+        locatie_banen = self._banen_per_locatie.get(voorkeur_locatie, ())
+        dag_banen = [b for b in locatie_banen if b['Dag'] == voorkeur_dag]
         
         for baan in dag_banen:
             if self._zijn_alle_spelers_beschikbaar(groep_spelers, voorkeur_dag, baan['Tijdslot'], voorkeur_locatie):
                 return {'tijdslot': baan['Tijdslot'], 'baan': baan['BaanNaam']}
         
         # Probeer andere dagen, zelfde locatie
-        andere_banen = [b for b in self.banen if b['Locatie'] == voorkeur_locatie]
-        
-        for baan in andere_banen:
+        for baan in locatie_banen:
             if self._zijn_alle_spelers_beschikbaar(groep_spelers, baan['Dag'], baan['Tijdslot'], voorkeur_locatie):
                 return {'tijdslot': baan['Tijdslot'], 'baan': baan['BaanNaam']}
         
@@ -1555,6 +1807,16 @@ class HybridPlanningAlgorithm:
     def plan_legacy_groepen(self, aantal_weken: int = 12):
         """Plan alle legacy groepen in voor alle weken"""
         print("=== FASE 0: LEGACY GROEPEN PLANNING ===")
+        # Baan-index zodat _vind_beschikbare_baan niet per baan de hele planning hoeft te scannen
+        self._bouw_planning_index()
+        try:
+            self._plan_legacy_weken(aantal_weken)
+        finally:
+            self._planning_index = None
+            self._planning_per_week = None
+
+    def _plan_legacy_weken(self, aantal_weken: int):
+        """Plan de legacy groepen week voor week in en rapporteer de redenen van afwijzing"""
         legacy_gepland = 0
         legacy_mislukt = 0
         week1_count = 0
@@ -1567,27 +1829,16 @@ class HybridPlanningAlgorithm:
             'groepgrootte_ongeldig': 0,
             'via_alternatief_tijdslot': 0
         }
+        # De blijvers van een legacy groep zijn elke week gelijk: eenmalig opzoeken
+        blijvers_per_groep = [self._legacy_blijvers(legacy_groep) for legacy_groep in self.legacy_groepen]
+        velden_per_samenstelling = {}  # Speler indices (in groepsvolgorde) -> (namen, gender, niveau, volledig, score)
         for week_nummer in range(1, aantal_weken + 1):
             if week_nummer not in self.ingeplande_spelers_per_week:
                 self.ingeplande_spelers_per_week[week_nummer] = set()
             week_volledig_legacy_count = 0
             week_gedeeltelijk_legacy_count = 0
-            for legacy_groep in self.legacy_groepen:
-                speler_namen = [naam.strip() for naam in legacy_groep['Spelers'].split(',')]
-                groep_spelers = []
-                gevonden_spelers = []
-                niet_gevonden_spelers = []
-                willen_niet_blijven = []
-                for naam in speler_namen:
-                    speler = self._vind_speler_by_naam(naam)
-                    if speler:
-                        gevonden_spelers.append(naam)
-                        if speler.get('BlijftInHuidigeGroep', '').lower() == 'ja':
-                            groep_spelers.append(speler)
-                        else:
-                            willen_niet_blijven.append(naam)
-                    else:
-                        niet_gevonden_spelers.append(naam)
+            for legacy_groep, blijvers in zip(self.legacy_groepen, blijvers_per_groep):
+                groep_spelers = list(blijvers)
                 aantal_blijvers = len(groep_spelers)
                 if aantal_blijvers < 2:
                     redenen['te_weinig_blijvers'] += 1
@@ -1602,14 +1853,15 @@ class HybridPlanningAlgorithm:
                     if week_nummer not in self.ingeplande_spelers_per_week:
                         self.ingeplande_spelers_per_week[week_nummer] = set()
                     ingeplande_ids = self.ingeplande_spelers_per_week[week_nummer]
-                    unplaced_players = [s for s in self.spelers if s['SpelerID'] not in ingeplande_ids and s['SpelerID'] not in [sp['SpelerID'] for sp in groep_spelers]]
-                    slot_candidates = [p for p in unplaced_players if self._zijn_alle_spelers_beschikbaar([p], dag, tijdslot, originele_locatie)]
+                    groep_ids = {sp['SpelerID'] for sp in groep_spelers}
+                    slot_candidates = [p for p in self._beschikbare_spelers_voor_slot(dag, tijdslot, originele_locatie)
+                                       if p['SpelerID'] not in ingeplande_ids and p['SpelerID'] not in groep_ids]
                     while len(groep_spelers) < target_size and slot_candidates:
                         beste_kandidaat = self._vind_best_passende_speler(slot_candidates, groep_spelers)
                         if beste_kandidaat:
                             groep_spelers.append(beste_kandidaat)
-                            slot_candidates.remove(beste_kandidaat)
-                            unplaced_players.remove(beste_kandidaat)
+                            # Op identiteit verwijderen i.p.v. list.remove met dict vergelijkingen
+                            slot_candidates = [p for p in slot_candidates if p is not beste_kandidaat]
                         else:
                             break
                 if len(groep_spelers) > target_size:
@@ -1618,8 +1870,7 @@ class HybridPlanningAlgorithm:
                 alternatief_slot = None
                 if not spelers_beschikbaar:
                     # Probeer alternatieve tijdsloten op dezelfde locatie
-                    alternatieven = [b for b in self.banen if b['Locatie'] == originele_locatie]
-                    for baan in alternatieven:
+                    for baan in self._banen_per_locatie.get(originele_locatie, ()):
                         if self._zijn_alle_spelers_beschikbaar(groep_spelers, baan['Dag'], baan['Tijdslot'], originele_locatie):
                             # Check of baan beschikbaar is
                             if self._vind_beschikbare_baan(week_nummer, baan['Dag'], originele_locatie, baan['Tijdslot']):
@@ -1652,16 +1903,25 @@ class HybridPlanningAlgorithm:
                     continue
                 for speler in groep_spelers:
                     self.ingeplande_spelers_per_week[week_nummer].add(speler['SpelerID'])
-                groep_namen = ', '.join([f"{s['Voornaam']} {s['Achternaam']}" for s in groep_spelers])
-                gender_balans = self._bepaal_gender_balans_string(groep_spelers)
-                niveau = self._bepaal_niveau_string(groep_spelers)
-                legacy_info = self._bepaal_legacy_status(groep_spelers)
-                is_volledig_legacy = legacy_info['aantal_blijvend'] == legacy_info['totaal_origineel']
+                # Dezelfde samenstelling komt elke week terug: omschrijving en score eenmalig bepalen
+                samenstelling = tuple(s['_index'] for s in groep_spelers)
+                velden = velden_per_samenstelling.get(samenstelling)
+                if velden is None:
+                    legacy_info = self._bepaal_legacy_status(groep_spelers)
+                    is_volledig_legacy = legacy_info['aantal_blijvend'] == legacy_info['totaal_origineel']
+                    if is_volledig_legacy:
+                        legacy_score = self.legacy_scoring['volledige_legacy_score']
+                    else:
+                        legacy_score = self._bereken_legacy_score(legacy_info)
+                    velden = (', '.join([s['_volledige_naam'] for s in groep_spelers]),
+                              self._bepaal_gender_balans_string(groep_spelers),
+                              self._bepaal_niveau_string(groep_spelers),
+                              is_volledig_legacy, legacy_score)
+                    velden_per_samenstelling[samenstelling] = velden
+                groep_namen, gender_balans, niveau, is_volledig_legacy, legacy_score = velden
                 if is_volledig_legacy:
-                    legacy_score = self.legacy_scoring['volledige_legacy_score']
                     week_volledig_legacy_count += 1
                 else:
-                    legacy_score = self._bereken_legacy_score(legacy_info)
                     week_gedeeltelijk_legacy_count += 1
                 if is_volledig_legacy:
                     groep_type = "legacy_volledig"
@@ -1683,7 +1943,7 @@ class HybridPlanningAlgorithm:
                     'legacy': True,
                     'legacy_type': groep_type
                 }
-                self.planning.append(match)
+                self._voeg_match_toe(match)
                 legacy_gepland += 1
             if week_nummer == 1:
                 week1_count = week_volledig_legacy_count + week_gedeeltelijk_legacy_count
@@ -1812,7 +2072,7 @@ class HybridPlanningAlgorithm:
 
     def _bepaal_gender_balans_string(self, groep: List[Dict]) -> str:
         """Bepaalt de omschrijving van de geslachtsbalans voor een groep."""
-        mannen_count = sum(1 for s in groep if s.get('Geslacht') in ['M', 'Man', 'Jongen'])
+        mannen_count = sum(1 for s in groep if s['_is_man'])
         vrouwen_count = len(groep) - mannen_count
 
         if mannen_count == len(groep):
@@ -1826,26 +2086,15 @@ class HybridPlanningAlgorithm:
 
     def _bepaal_niveau_string(self, groep: List[Dict]) -> str:
         """Bepaalt de omschrijving van het niveau voor een groep."""
-        niveaus = [float(s['Niveau']) for s in groep if s.get('Niveau')]
+        niveaus = [s['_niveau'] for s in groep if s['_niveau'] is not None]
         if not niveaus:
             return "Onbekend"
         
-        if len(set(niveaus)) == 1:
-            return str(int(niveaus[0]))
+        laagste, hoogste = min(niveaus), max(niveaus)
+        if laagste == hoogste:
+            return str(int(laagste))
         else:
-            return f"{int(min(niveaus))}-{int(max(niveaus))} (gemengd)"
-
-    def _get_gecorrigeerd_niveau(self, speler: Dict) -> float:
-        """Geeft het niveau van een speler terug, gecorrigeerd voor gender."""
-        try:
-            niveau = float(speler.get('Niveau', 0))
-            if not niveau: # Speler heeft geen niveau
-                return 0.0
-            if speler.get('Geslacht') in ['V', 'Vrouw', 'Meisje']:
-                return niveau + self.gender_compensatie['dame_niveau_bonus']
-            return niveau
-        except (ValueError, TypeError):
-            return 0.0
+            return f"{int(laagste)}-{int(hoogste)} (gemengd)"
 
 if __name__ == '__main__':
     # Initialiseer algoritme
@@ -0,0 +1,50 @@
+import os
+import sys
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from planning_algorithm import HybridPlanningAlgorithm
+
+
+def maak_speler(speler_id, voornaam, geslacht, niveau='6', locatie='Joy Jaagpad'):
+    """Maak een spelerregel zoals die uit de spelers CSV komt"""
+    speler = {
+        'SpelerID': speler_id, 'Voornaam': voornaam, 'Achternaam': 'Test', 'Email': '',
+        'Niveau': niveau, 'Geslacht': geslacht, 'LocatieVoorkeur': locatie, 'VoorkeurTrainer': '',
+        'SamenMet': '', 'Geboortedatum': '', 'Leeftijd': '30', 'BlijftInHuidigeGroep': '',
+    }
+    for dag in ['Maandag', 'Dinsdag', 'Woensdag', 'Donderdag', 'Vrijdag', 'Zaterdag', 'Zondag']:
+        speler[dag] = '18:00-21:00' if dag == 'Maandag' else 'Niet beschikbaar'
+    return speler
+
+
+class TestOptimizeGroupsInSlot(unittest.TestCase):
+    def setUp(self):
+        self.algoritme = HybridPlanningAlgorithm()
+
+    def _laad(self, spelers):
+        self.algoritme.spelers = spelers
+        self.algoritme._bereid_speler_kenmerken_voor()
+        self.algoritme._bouw_voorkeur_mappings()
+        self.algoritme._score_cache = {}
+
+    def test_gedeeld_speler_id_komt_maar_in_een_groep(self):
+        # Een man en een vrouw met hetzelfde SpelerID in hetzelfde slot
+        spelers = [maak_speler(str(i), f'Man{i}', 'Man') for i in range(1, 5)]
+        spelers.append(maak_speler('4', 'Vrouw4', 'Vrouw'))
+        spelers.extend(maak_speler(str(i), f'Vrouw{i}', 'Vrouw') for i in range(5, 9))
+        self._laad(spelers)
+
+        groepen = self.algoritme.optimize_groups_in_slot(spelers, 4, 'Joy Jaagpad')
+
+        self.assertEqual(len(groepen), 2)
+        aantal_per_id = Counter(s['SpelerID'] for groep in groepen for s in groep)
+        self.assertEqual(max(aantal_per_id.values()), 1)
+        vrouwen_groep = next(g for g in groepen if all(s['_is_vrouw'] for s in g))
+        self.assertEqual([s['SpelerID'] for s in vrouwen_groep], ['5', '6', '7', '8'])
+
+
+if __name__ == '__main__':
+    unittest.main()